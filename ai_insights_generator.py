@@ -12,15 +12,22 @@ Features:
 
 import streamlit as st
 from typing import Dict, List, Tuple
+import asyncio
+import hashlib
 import json
 
-def generate_comprehensive_insights(assessment: Dict, questions: List) -> Dict:
+def generate_comprehensive_insights(assessment: Dict, questions: List, generation: int = 0) -> Dict:
     """
     Generate comprehensive AI insights for the assessment
     
+    The six pillar analyses and the overall summary are requested
+    concurrently, and the composed result is cached across sessions for
+    identical assessment data.
+    
     Args:
         assessment: Assessment data with responses
         questions: List of all Question objects
+        generation: Bump to bypass the cached result for the same data (Regenerate)
         
     Returns:
         Dictionary with insights organized by pillar
@@ -28,7 +35,7 @@ def generate_comprehensive_insights(assessment: Dict, questions: List) -> Dict:
     
     # Check if Anthropic is available and get API key
     try:
-        import anthropic
+        import anthropic  # noqa: F401 - fail early if the SDK is missing
         
         # Try multiple locations for API key (support different formats)
         api_key = None
@@ -51,22 +58,107 @@ def generate_comprehensive_insights(assessment: Dict, questions: List) -> Dict:
         
         if not api_key:
             return {"error": "Anthropic API key not configured. Add ANTHROPIC_API_KEY to Streamlit secrets."}
-        
-        client = anthropic.Anthropic(api_key=api_key)
     except Exception as e:
         return {"error": f"Anthropic API error: {str(e)}"}
     
     # Prepare assessment data for AI analysis
     analysis_data = prepare_assessment_data(assessment, questions)
     
-    # Generate insights using Claude
-    try:
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            messages=[{
-                "role": "user",
-                "content": f"""You are an AWS Well-Architected Framework expert. Analyze this assessment and provide comprehensive insights.
+    # Cache key: everything the prompts are built from (responses included),
+    # plus a short hash of the API key - never the key itself - and the
+    # caller's generation counter
+    data_hash = hashlib.sha256(json.dumps(analysis_data, sort_keys=True).encode()).hexdigest()
+    api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()[:8]
+    
+    # Generate insights using Claude. The status box lives out here, not in
+    # the cached function, so a cache hit doesn't replay stale UI.
+    pillar_count = len(analysis_data['pillar_data'])
+    with st.status(f"Analyzing {pillar_count} pillars in parallel...", expanded=False) as status:
+        try:
+            insights = _generate_insights_cached(data_hash, api_key_hash, generation, analysis_data, api_key)
+        except _PartialInsights as partial:
+            status.update(label=f"Analysis partly complete ({partial.failed} of {pillar_count + 1} requests failed)",
+                          state="error")
+            return partial.insights
+        except Exception as e:
+            status.update(label="Analysis failed", state="error")
+            return {"error": f"AI generation failed: {str(e)}"}
+        status.update(label="Analysis complete", state="complete")
+    return insights
+
+
+class _PartialInsights(Exception):
+    """Raised with the composed insights when some requests failed, so they are shown but not cached"""
+    
+    def __init__(self, insights: Dict, failed: int):
+        super().__init__(f"{failed} insight requests failed")
+        self.insights = insights
+        self.failed = failed
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _generate_insights_cached(data_hash: str, api_key_hash: str, generation: int,
+                              _analysis_data: Dict, _api_key: str) -> Dict:
+    """
+    Run all insight requests concurrently and compose the result.
+    
+    Keyed by data_hash/api_key_hash/generation only. Failures raise, so they
+    are never cached: all requests failing raises the first error, and some
+    failing raises _PartialInsights carrying what did succeed.
+    """
+    import anthropic
+    
+    pillar_names = list(_analysis_data['pillar_data'])
+    
+    async def gather_all():
+        async with anthropic.AsyncAnthropic(api_key=_api_key) as client:
+            return await asyncio.gather(
+                _request_json(client, _overall_prompt(_analysis_data), 3000),
+                *(_request_json(client, _pillar_prompt(_analysis_data, name), 1500)
+                  for name in pillar_names),
+                return_exceptions=True
+            )
+    
+    overall, *pillar_results = asyncio.run(gather_all())
+    errors = [r for r in (overall, *pillar_results) if isinstance(r, Exception)]
+    if len(errors) == len(pillar_results) + 1:
+        raise errors[0]
+    
+    if isinstance(overall, Exception):
+        insights = {'executive_summary': f"Summary unavailable: {overall}"}
+    else:
+        insights = overall
+    insights['pillars'] = {
+        name: {'status': 'Unavailable', 'error': str(result)} if isinstance(result, Exception) else result
+        for name, result in zip(pillar_names, pillar_results)
+    }
+    if errors:
+        raise _PartialInsights(insights, len(errors))
+    return insights
+
+
+async def _request_json(client, prompt: str, max_tokens: int) -> Dict:
+    """Send one prompt and parse the JSON object out of the reply"""
+    response = await client.messages.create(
+        model="claude-sonnet-4-20250514",
+        max_tokens=max_tokens,
+        messages=[{"role": "user", "content": prompt}]
+    )
+    
+    # Parse the response
+    insights_text = response.content[0].text
+    
+    # Extract JSON from response (in case there's any wrapper text)
+    start_idx = insights_text.find('{')
+    end_idx = insights_text.rfind('}') + 1
+    if start_idx != -1 and end_idx > start_idx:
+        return json.loads(insights_text[start_idx:end_idx])
+    raise ValueError("Failed to parse AI response")
+
+
+def _overall_prompt(analysis_data: Dict) -> str:
+    """Prompt for the assessment-wide summary, quick wins and risk summary"""
+    return f"""You are an AWS Well-Architected Framework expert. Analyze this assessment and provide comprehensive insights.
 
 Assessment Data:
 {json.dumps(analysis_data, indent=2)}
@@ -76,28 +168,6 @@ Provide a detailed analysis in the following JSON format:
     "executive_summary": "2-3 paragraph summary of overall assessment",
     "overall_strengths": ["list of 3-5 key strengths"],
     "overall_weaknesses": ["list of 3-5 critical areas needing attention"],
-    "pillars": {{
-        "Operational Excellence": {{
-            "score": {analysis_data['pillar_scores'].get('Operational Excellence', 0)},
-            "status": "Excellent/Good/Needs Improvement/Critical",
-            "strengths": ["specific strengths in this pillar"],
-            "weaknesses": ["specific weaknesses in this pillar"],
-            "recommendations": [
-                {{
-                    "title": "Recommendation title",
-                    "description": "Detailed description",
-                    "impact": "High/Medium/Low",
-                    "effort": "High/Medium/Low",
-                    "priority": "Critical/High/Medium/Low"
-                }}
-            ]
-        }},
-        "Security": {{ ... similar structure ... }},
-        "Reliability": {{ ... }},
-        "Performance Efficiency": {{ ... }},
-        "Cost Optimization": {{ ... }},
-        "Sustainability": {{ ... }}
-    }},
     "quick_wins": ["list of 3-5 quick wins that can be implemented immediately"],
     "long_term_initiatives": ["list of 3-5 strategic initiatives"],
     "risk_summary": {{
@@ -115,24 +185,43 @@ Focus on:
 5. Prioritization based on risk and impact
 
 Respond ONLY with valid JSON, no other text."""
-            }]
-        )
-        
-        # Parse the response
-        insights_text = response.content[0].text
-        
-        # Extract JSON from response (in case there's any wrapper text)
-        start_idx = insights_text.find('{')
-        end_idx = insights_text.rfind('}') + 1
-        if start_idx != -1 and end_idx > start_idx:
-            insights_json = insights_text[start_idx:end_idx]
-            insights = json.loads(insights_json)
-            return insights
-        else:
-            return {"error": "Failed to parse AI response"}
-            
-    except Exception as e:
-        return {"error": f"AI generation failed: {str(e)}"}
+
+
+def _pillar_prompt(analysis_data: Dict, pillar_name: str) -> str:
+    """Prompt for the deep dive into a single pillar"""
+    pillar_context = {
+        'assessment_name': analysis_data['assessment_name'],
+        'workload_name': analysis_data['workload_name'],
+        'environment': analysis_data['environment'],
+        'assessment_type': analysis_data['assessment_type'],
+        'pillar': pillar_name,
+        'pillar_score': analysis_data['pillar_scores'].get(pillar_name, 0),
+        'pillar_data': analysis_data['pillar_data'][pillar_name]
+    }
+    return f"""You are an AWS Well-Architected Framework expert. Analyze the {pillar_name} pillar of this assessment.
+
+Pillar Data:
+{json.dumps(pillar_context, indent=2)}
+
+Provide a detailed analysis in the following JSON format:
+{{
+    "score": {pillar_context['pillar_score']},
+    "status": "Excellent/Good/Needs Improvement/Critical",
+    "strengths": ["specific strengths in this pillar"],
+    "weaknesses": ["specific weaknesses in this pillar"],
+    "recommendations": [
+        {{
+            "title": "Recommendation title",
+            "description": "Detailed description",
+            "impact": "High/Medium/Low",
+            "effort": "High/Medium/Low",
+            "priority": "Critical/High/Medium/Low"
+        }}
+    ]
+}}
+
+Focus on specific findings from the answers, actionable next steps, and the AWS
+services that can help. Respond ONLY with valid JSON, no other text."""
 
 
 def prepare_assessment_data(assessment: Dict, questions: List) -> Dict:
@@ -248,6 +337,10 @@ def format_insights_for_display(insights: Dict) -> None:
     for pillar_name, pillar_data in pillars.items():
         with st.expander(f"### {get_pillar_emoji(pillar_name)} {pillar_name} - {pillar_data.get('status', 'N/A')}", expanded=False):
             
+            if 'error' in pillar_data:
+                st.warning(f"⚠️ Analysis for this pillar failed: {pillar_data['error']}. Regenerate to retry.")
+                continue
+            
             # Pillar score and status
             col_score, col_status = st.columns([1, 2])
             with col_score:
@@ -0,0 +1,197 @@
+"""
+Local Assessment Store Module
+Persists WAF assessments to a SQLite file when Firebase is not configured
+
+Features:
+- Save/Load/Delete WAF assessments
+- Survives browser refreshes and app restarts on the same host
+- User-specific data isolation (signed-in users), one shared local owner otherwise
+- Lightweight listing rows, so only the open assessment is held in full
+- One shared connection per process
+"""
+
+import streamlit as st
+import sqlite3
+import threading
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+DB_PATH = "waf_assessments.db"
+
+# Owner of rows saved without a signed-in user. The store is only used when
+# Firebase (and so sign-in) is off, where the app has a single local user.
+LOCAL_OWNER_UID = "local"
+
+# Fields copied as-is into a listing row
+LISTING_FIELDS = ('name', 'status', 'created_at', 'updated_at', 'progress', 'overall_score', 'is_portfolio')
+
+# Collections the list and analytics views only ever count
+LISTING_COUNTS = ('auto_detected', 'action_items', 'accounts')
+
+# The connection is shared by every session's thread; sqlite3 objects are
+# not safe for concurrent use, so statements are serialized here
+_db_lock = threading.Lock()
+
+def _current_user_uid() -> str:
+    """Owner key for stored rows: the signed-in uid, else the local owner"""
+    return st.session_state.get('user_uid') or LOCAL_OWNER_UID
+
+def assessment_summary(assessment_id: str, assessment_data: Dict) -> Dict[str, Any]:
+    """
+    Listing row for an assessment: its listing fields plus
+    '<collection>_count' for each counted collection, flagged '_summary'
+    """
+    summary = {'id': assessment_id, '_summary': True}
+    for name in LISTING_FIELDS:
+        if name in assessment_data:
+            summary[name] = assessment_data[name]
+    for name in LISTING_COUNTS:
+        summary[f'{name}_count'] = len(assessment_data.get(name) or ())
+    return summary
+
+@st.cache_resource
+def _get_connection() -> sqlite3.Connection:
+    """Open the assessment database once per process"""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS waf_assessments (
+            id TEXT PRIMARY KEY,
+            user_uid TEXT NOT NULL,
+            updated_at TEXT,
+            summary TEXT,
+            data TEXT NOT NULL
+        )
+    """)
+    # Databases created before listing rows existed lack the summary column
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(waf_assessments)")}
+    if 'summary' not in columns:
+        conn.execute("ALTER TABLE waf_assessments ADD COLUMN summary TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_waf_assessments_user ON waf_assessments (user_uid, updated_at)")
+    conn.commit()
+    return conn
+
+def save_assessment_locally(assessment_id: str, assessment_data: Dict) -> Tuple[bool, str]:
+    """
+    Save assessment to the local SQLite store
+
+    Args:
+        assessment_id: Unique assessment identifier
+        assessment_data: Assessment data dictionary
+
+    Returns:
+        (success, message)
+    """
+    try:
+        user_uid = _current_user_uid()
+        updated_at = assessment_data.get('updated_at') or datetime.now().isoformat()
+        summary = json.dumps(assessment_summary(assessment_id, assessment_data), default=str)
+        data = json.dumps(assessment_data, default=str)
+
+        with _db_lock:
+            conn = _get_connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO waf_assessments (id, user_uid, updated_at, summary, data) VALUES (?, ?, ?, ?, ?)",
+                (assessment_id, user_uid, updated_at, summary, data)
+            )
+            conn.commit()
+
+        return True, "Assessment saved locally"
+
+    except Exception as e:
+        return False, f"Error saving assessment: {str(e)}"
+
+def list_local_assessments() -> Tuple[bool, str, List[Dict]]:
+    """
+    List listing rows (see assessment_summary) for the current user, newest first
+
+    Returns:
+        (success, message, list_of_summaries)
+    """
+    try:
+        user_uid = _current_user_uid()
+
+        with _db_lock:
+            rows = _get_connection().execute(
+                "SELECT id, summary, CASE WHEN summary IS NULL THEN data END "
+                "FROM waf_assessments WHERE user_uid = ? ORDER BY updated_at DESC",
+                (user_uid,)
+            ).fetchall()
+
+        summaries = []
+        for assessment_id, summary, data in rows:
+            if summary is not None:
+                summaries.append(json.loads(summary))
+            else:
+                # Row saved before listing rows existed: derive it once here
+                summaries.append(assessment_summary(assessment_id, json.loads(data)))
+
+        return True, f"Found {len(summaries)} assessments", summaries
+
+    except Exception as e:
+        return False, f"Error listing assessments: {str(e)}", []
+
+def load_local_assessment(assessment_id: str) -> Tuple[bool, str, Optional[Dict]]:
+    """
+    Load one full assessment from the local SQLite store
+
+    Args:
+        assessment_id: Unique assessment identifier
+
+    Returns:
+        (success, message, assessment_data)
+    """
+    try:
+        user_uid = _current_user_uid()
+
+        with _db_lock:
+            row = _get_connection().execute(
+                "SELECT data FROM waf_assessments WHERE id = ? AND user_uid = ?",
+                (assessment_id, user_uid)
+            ).fetchone()
+
+        if row is None:
+            return False, "Assessment not found", None
+
+        assessment = json.loads(row[0])
+        assessment['id'] = assessment_id
+        return True, "Assessment loaded", assessment
+
+    except Exception as e:
+        return False, f"Error loading assessment: {str(e)}", None
+
+def delete_local_assessment(assessment_id: str) -> Tuple[bool, str]:
+    """
+    Delete assessment from the local SQLite store
+
+    Args:
+        assessment_id: Unique assessment identifier
+
+    Returns:
+        (success, message)
+    """
+    try:
+        user_uid = _current_user_uid()
+
+        with _db_lock:
+            conn = _get_connection()
+            conn.execute(
+                "DELETE FROM waf_assessments WHERE id = ? AND user_uid = ?",
+                (assessment_id, user_uid)
+            )
+            conn.commit()
+
+        return True, "Assessment deleted successfully"
+
+    except Exception as e:
+        return False, f"Error deleting assessment: {str(e)}"
+
+# Export all functions
+__all__ = [
+    'LOCAL_OWNER_UID',
+    'assessment_summary',
+    'save_assessment_locally',
+    'list_local_assessments',
+    'load_local_assessment',
+    'delete_local_assessment'
+]
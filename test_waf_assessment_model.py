@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for the WAFAssessment data model in waf_review_module
+Checks scoring and serialization of assessments built through the model API
+
+Usage:
+    python test_waf_assessment_model.py
+"""
+
+import sys
+import os
+import json
+import copy
+import pickle
+from dataclasses import asdict
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime
+
+from waf_review_module import (
+    WAFAssessment, AssessmentType, ActionItem, Response, Pillar, RiskLevel,
+    get_questions_by_id, get_complete_waf_questions
+)
+
+
+def _answer(assessment, question_id, choice_letter):
+    """Record choice <letter> for a question through set_response"""
+    question = get_questions_by_id()[question_id]
+    assessment.set_response(
+        question,
+        Response(question_id=question_id, choice_id=f"{question_id}-{choice_letter}")
+    )
+
+
+def test_json_after_set_response():
+    """A scored assessment must still serialize with json.dumps(asdict(...))"""
+    print("=" * 60)
+    print("TEST 1: JSON serialization after set_response")
+    print("=" * 60)
+
+    assessment = WAFAssessment(id="t1", assessment_type=AssessmentType.STANDARD)
+    _answer(assessment, "SEC-IAM-001", "A")
+    _answer(assessment, "OPS-ORG-001", "C")
+
+    payload = json.dumps(asdict(assessment), default=str)
+    data = json.loads(payload)
+    assert set(data['responses']) == {"SEC-IAM-001", "OPS-ORG-001"}
+    assert data['overall_score'] == assessment.overall_score
+    assert not any(key.startswith('_') for key in data), "private caches leaked into asdict()"
+
+    print(f"✅ SUCCESS: serialized {len(payload)} bytes")
+    return True
+
+
+def test_scores_match_question_walk():
+    """Stored scores must match scoring over a plain list, even after a direct edit"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Stored scores after answers change")
+    print("=" * 60)
+
+    assessment = WAFAssessment(id="t2", assessment_type=AssessmentType.STANDARD)
+    _answer(assessment, "SEC-IAM-001", "A")
+    _answer(assessment, "SEC-IAM-002", "B")
+    _answer(assessment, "SEC-IAM-001", "D")
+
+    questions = list(get_complete_waf_questions())
+    assert assessment.overall_score == round(assessment.calculate_score(questions), 1)
+    assert assessment.pillar_scores[Pillar.SECURITY.value] == round(
+        assessment.calculate_pillar_score(Pillar.SECURITY, questions), 1
+    )
+
+    # Responses edited without set_response are scored as they stand
+    assessment.responses["SEC-IAM-002"] = Response(question_id="SEC-IAM-002", choice_id="SEC-IAM-002-D")
+    assert assessment.calculate_score(get_complete_waf_questions()) == assessment.calculate_score(questions)
+
+    print(f"✅ SUCCESS: overall {assessment.overall_score}, "
+          f"security {assessment.pillar_scores[Pillar.SECURITY.value]}")
+    return True
+
+
+def test_json_round_trip():
+    """from_stored must rebuild an equal assessment from its JSON dump"""
+    print("\n" + "=" * 60)
+    print("TEST 3: JSON round trip through from_stored")
+    print("=" * 60)
+
+    assessment = WAFAssessment(id="t3", assessment_type=AssessmentType.COMPREHENSIVE)
+    _answer(assessment, "OPS-ORG-002", "B")
+    assessment.action_items.append(ActionItem(
+        id="a1", title="Enable MFA", description="", pillar=Pillar.SECURITY,
+        risk_level=RiskLevel.HIGH, affected_resources=[], recommendation="",
+        implementation_steps=[], aws_services_used=["IAM"], estimated_effort="1 hour",
+        estimated_cost="$", priority=1, due_date=datetime(2025, 1, 31)
+    ))
+
+    data = json.loads(json.dumps(asdict(assessment), default=str))
+    restored = WAFAssessment.from_stored(data)
+    assert restored == assessment
+    assert [item.id for item in restored.get_high_priority_items()] == ["a1"]
+
+    print("✅ SUCCESS: restored assessment equals the original")
+    return True
+
+
+def test_questions_copyable():
+    """Catalog questions must survive pickle and deepcopy (st.cache_data, snapshots)"""
+    print("\n" + "=" * 60)
+    print("TEST 4: Question pickle and deepcopy")
+    print("=" * 60)
+
+    question = get_complete_waf_questions()[0]
+    assert pickle.loads(pickle.dumps(question)) == question
+    assert copy.deepcopy(question) == question
+    assert asdict(question)['compliance_mappings'] == question.compliance_mappings
+
+    print(f"✅ SUCCESS: {question.id} round-trips through pickle and deepcopy")
+    return True
+
+
+def main():
+    """Run all tests"""
+    tests = [
+        test_json_after_set_response,
+        test_scores_match_question_walk,
+        test_json_round_trip,
+        test_questions_copyable,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"❌ FAILED: {test.__name__}: {e}")
+            results.append(False)
+
+    print("\n" + "=" * 60)
+    if all(results):
+        print("✅ ALL TESTS PASSED!")
+    else:
+        print(f"❌ {results.count(False)} of {len(results)} tests failed")
+    print("=" * 60)
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -14,7 +14,9 @@ import streamlit as st
 from datetime import datetime
 from typing import Dict, List, Optional
 
-def render_questions_with_pagination(assessment: Dict, questions: List, pillar_filter: Optional[str] = None):
+@st.fragment
+def render_questions_with_pagination(assessment: Dict, questions: List, pillar_filter: Optional[str] = None,
+                                     filtered_questions: Optional[List] = None):
     """
     Enhanced question rendering with pagination and Firebase persistence
     
@@ -24,8 +26,14 @@ def render_questions_with_pagination(assessment: Dict, questions: List, pillar_f
     - Firebase auto-save
     - Progress tracking
     
+    Runs as a fragment: navigating, answering and saving only rerun this
+    section, not the whole assessment hub.
+    
     CRITICAL: 'questions' parameter must be the COMPLETE list of all 205 questions
               for accurate scoring calculation
+    
+    Callers holding a prebuilt per-pillar index can pass the display list as
+    'filtered_questions' to skip re-filtering all questions on every rerun.
     """
     
     # Import Firebase helper
@@ -39,10 +47,11 @@ def render_questions_with_pagination(assessment: Dict, questions: List, pillar_f
     all_questions = questions
     
     # Filter questions by pillar for DISPLAY only
-    if pillar_filter and pillar_filter != "All":
-        filtered_questions = [q for q in questions if q.pillar.value == pillar_filter]
-    else:
-        filtered_questions = questions
+    if filtered_questions is None:
+        if pillar_filter and pillar_filter != "All":
+            filtered_questions = [q for q in questions if q.pillar.value == pillar_filter]
+        else:
+            filtered_questions = questions
     
     total_questions = len(filtered_questions)
     
@@ -50,15 +59,16 @@ def render_questions_with_pagination(assessment: Dict, questions: List, pillar_f
         st.warning("No questions available")
         return
     
-    # Initialize pagination state
-    if 'current_question_index' not in st.session_state:
-        st.session_state.current_question_index = 0
+    # Initialize pagination state, one position per pillar so switching
+    # pillars doesn't lose your place
+    question_index = st.session_state.setdefault('question_index_by_pillar', {})
+    pillar_key = pillar_filter or "All"
     
     # Ensure index is within bounds
-    if st.session_state.current_question_index >= total_questions:
-        st.session_state.current_question_index = 0
+    if question_index.get(pillar_key, 0) >= total_questions:
+        question_index[pillar_key] = 0
     
-    current_index = st.session_state.current_question_index
+    current_index = question_index.get(pillar_key, 0)
     current_question = filtered_questions[current_index]
     
     # ============================================================================
@@ -90,26 +100,26 @@ def render_questions_with_pagination(assessment: Dict, questions: List, pillar_f
     
     with nav_col1:
         if st.button("⏮️ First", disabled=(current_index == 0), use_container_width=True):
-            st.session_state.current_question_index = 0
-            st.rerun()
+            question_index[pillar_key] = 0
+            st.rerun(scope="fragment")
     
     with nav_col2:
         if st.button("◀️ Previous", disabled=(current_index == 0), use_container_width=True):
-            st.session_state.current_question_index = max(0, current_index - 1)
-            st.rerun()
+            question_index[pillar_key] = max(0, current_index - 1)
+            st.rerun(scope="fragment")
     
     with nav_col3:
         st.markdown(f"### Question {current_index + 1} of {total_questions}")
     
     with nav_col4:
         if st.button("Next ▶️", disabled=(current_index >= total_questions - 1), use_container_width=True):
-            st.session_state.current_question_index = min(total_questions - 1, current_index + 1)
-            st.rerun()
+            question_index[pillar_key] = min(total_questions - 1, current_index + 1)
+            st.rerun(scope="fragment")
     
     with nav_col5:
         if st.button("Last ⏭️", disabled=(current_index >= total_questions - 1), use_container_width=True):
-            st.session_state.current_question_index = total_questions - 1
-            st.rerun()
+            question_index[pillar_key] = total_questions - 1
+            st.rerun(scope="fragment")
     
     st.markdown("---")
     
@@ -141,10 +151,12 @@ def render_questions_with_pagination(assessment: Dict, questions: List, pillar_f
         override = False
     
     # AI Assistance button
+    deep = st.toggle("Deep analysis", value=False, key=f"ai_deep_{current_question.id}",
+                     help="Use the larger, slower model for a more thorough answer")
     if st.button("🤖 Get AI Help", key=f"ai_help_{current_question.id}"):
         with st.spinner("Getting AI assistance..."):
             from waf_review_module import get_ai_question_assistance
-            ai_help = get_ai_question_assistance(current_question, assessment)
+            ai_help = get_ai_question_assistance(current_question, assessment, deep=deep)
             st.session_state[f"ai_assist_{current_question.id}"] = ai_help
     
     # Display AI assistance if available
@@ -161,34 +173,38 @@ def render_questions_with_pagination(assessment: Dict, questions: List, pillar_f
     # Answer choices
     st.markdown("### Select your answer:")
     
-    response_key = f"response_{current_question.id}"
-    selected_choice = st.radio(
-        "Choose one:",
-        range(len(current_question.choices)),
-        format_func=lambda i: f"{current_question.choices[i].risk_level.icon} {current_question.choices[i].text}",
-        key=response_key,
-        index=default_index,
-        disabled=(is_auto_detected and not override)
-    )
-    
-    # Show guidance for selected choice
-    if selected_choice is not None:
-        st.caption(f"💬 **Guidance:** {current_question.choices[selected_choice].guidance}")
-    
-    # Notes
-    notes_default = ""
-    if is_auto_detected and not override:
-        notes_default = "Auto-detected from AWS scan\n" + "\n".join([f"• {e}" for e in detected_data.get('evidence', [])])
-    elif current_response:
-        notes_default = current_response.get('notes', '')
-    
-    notes = st.text_area(
-        "Additional Notes & Evidence",
-        value=notes_default,
-        key=f"notes_{current_question.id}",
-        placeholder="Add context, evidence, or observations that support your answer...",
-        height=100
-    )
+    # Answer and notes are batched in a form so typing/selecting doesn't rerun
+    with st.form(f"q_form_{current_question.id}", clear_on_submit=False):
+        response_key = f"response_{current_question.id}"
+        selected_choice = st.radio(
+            "Choose one:",
+            range(len(current_question.choices)),
+            format_func=lambda i: current_question.choices[i].choice_label,
+            key=response_key,
+            index=default_index,
+            disabled=(is_auto_detected and not override)
+        )
+        
+        # Show guidance for selected choice (refreshes on submit)
+        if selected_choice is not None:
+            st.caption(f"💬 **Guidance:** {current_question.choices[selected_choice].guidance}")
+        
+        # Notes
+        notes_default = ""
+        if is_auto_detected and not override:
+            notes_default = "Auto-detected from AWS scan\n" + "\n".join([f"• {e}" for e in detected_data.get('evidence', [])])
+        elif current_response:
+            notes_default = current_response.get('notes', '')
+        
+        notes = st.text_area(
+            "Additional Notes & Evidence",
+            value=notes_default,
+            key=f"notes_{current_question.id}",
+            placeholder="Add context, evidence, or observations that support your answer...",
+            height=100
+        )
+        
+        submitted = st.form_submit_button("💾 Save Response", use_container_width=True, type="primary")
     
     # ============================================================================
     # SAVE BUTTON (WITH FIREBASE INTEGRATION)
@@ -197,7 +213,9 @@ def render_questions_with_pagination(assessment: Dict, questions: List, pillar_f
     col1, col2 = st.columns([3, 1])
     
     with col1:
-        if st.button("💾 Save Response", key=f"save_{current_question.id}", use_container_width=True, type="primary"):
+        if submitted:
+            now_iso = datetime.now().isoformat()
+            
             # Prepare response data
             response_data = {
                 'choice_index': selected_choice,
@@ -205,7 +223,7 @@ def render_questions_with_pagination(assessment: Dict, questions: List, pillar_f
                 'risk_level': current_question.choices[selected_choice].risk_level.label,
                 'points': current_question.choices[selected_choice].points,
                 'notes': notes,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'ai_assisted': f"ai_assist_{current_question.id}" in st.session_state,
                 'auto_detected': is_auto_detected,
                 'overridden': (is_auto_detected and override),
@@ -216,8 +234,13 @@ def render_questions_with_pagination(assessment: Dict, questions: List, pillar_f
             if 'responses' not in assessment:
                 assessment['responses'] = {}
             
+            previous_response = assessment['responses'].get(current_question.id)
             assessment['responses'][current_question.id] = response_data
             
+            # Keep the dashboard's per-pillar running totals in step
+            from waf_review_module import record_response_aggregate
+            record_response_aggregate(assessment, current_question.id, previous_response, response_data)
+            
             # ======================================================================
             # CALCULATE SCORES - FIX FOR 0 SCORE ISSUE
             # CRITICAL: Use ALL questions (all_questions), NOT filtered questions!
@@ -238,7 +261,7 @@ def render_questions_with_pagination(assessment: Dict, questions: List, pillar_f
                 st.error(f"Scoring calculation error: {str(e)}")
             
             # Update timestamp
-            assessment['updated_at'] = datetime.now().isoformat()
+            assessment['updated_at'] = now_iso
             
             # Track AI assistance
             if f"ai_assist_{current_question.id}" in st.session_state:
@@ -264,20 +287,24 @@ def render_questions_with_pagination(assessment: Dict, questions: List, pillar_f
                 else:
                     st.success("✅ Response saved successfully!")
             else:
-                st.success("✅ Response saved locally!")
-                st.info("💡 Enable Firebase to persist data across sessions")
+                from local_assessment_store import save_assessment_locally
+                success, message = save_assessment_locally(assessment.get('id'), assessment)
+                if success:
+                    st.success("✅ Response saved locally!")
+                else:
+                    st.warning(f"⚠️ Response kept for this session only: {message}")
             
             # Auto-advance to next question
             if current_index < total_questions - 1:
-                st.session_state.current_question_index = current_index + 1
+                question_index[pillar_key] = current_index + 1
             
-            st.rerun()
+            st.rerun(scope="fragment")
     
     with col2:
         if st.button("⏭️ Skip", key=f"skip_{current_question.id}", use_container_width=True):
             if current_index < total_questions - 1:
-                st.session_state.current_question_index = current_index + 1
-                st.rerun()
+                question_index[pillar_key] = current_index + 1
+                st.rerun(scope="fragment")
     
     # ============================================================================
     # QUESTION NAVIGATION MAP (BOTTOM)
@@ -286,38 +313,28 @@ def render_questions_with_pagination(assessment: Dict, questions: List, pillar_f
     st.markdown("---")
     st.markdown("### 📍 Question Navigator")
     
-    # Group questions in rows of 10
-    questions_per_row = 10
-    rows = [filtered_questions[i:i + questions_per_row] for i in range(0, len(filtered_questions), questions_per_row)]
+    # One selectbox instead of a button per question; answered ones are ticked
+    responses = assessment.get('responses', {})
     
-    for row_idx, row_questions in enumerate(rows):
-        cols = st.columns(len(row_questions))
-        for col_idx, q in enumerate(row_questions):
-            q_idx = row_idx * questions_per_row + col_idx
-            is_answered = q.id in assessment.get('responses', {})
-            is_current = q_idx == current_index
-            
-            # Button styling
-            if is_current:
-                button_type = "primary"
-                button_label = f"▶ {q_idx + 1}"
-            elif is_answered:
-                button_type = "secondary"
-                button_label = f"✓ {q_idx + 1}"
-            else:
-                button_type = "secondary"
-                button_label = f"{q_idx + 1}"
-            
-            with cols[col_idx]:
-                if st.button(
-                    button_label,
-                    key=f"nav_q_{q.id}",
-                    use_container_width=True,
-                    type=button_type,
-                    help=f"{q.text[:50]}..."
-                ):
-                    st.session_state.current_question_index = q_idx
-                    st.rerun()
+    def nav_label(q_idx):
+        q = filtered_questions[q_idx]
+        if q_idx == current_index:
+            marker = "▶"
+        elif q.id in responses:
+            marker = "✓"
+        else:
+            marker = "○"
+        return f"{marker} {q_idx + 1}. {q.id}: {q.text[:50]}..."
+    
+    jump_index = st.selectbox(
+        "Jump to question",
+        range(total_questions),
+        index=current_index,
+        format_func=nav_label
+    )
+    if jump_index != current_index:
+        question_index[pillar_key] = jump_index
+        st.rerun(scope="fragment")
     
     # Best practices
     with st.expander("📚 Best Practices & Guidance"):
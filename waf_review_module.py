@@ -22,31 +22,44 @@ from __future__ import annotations
 import streamlit as st
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
+from types import MappingProxyType
+from collections import defaultdict
+from functools import cache, lru_cache
+from contextlib import contextmanager
+from contextvars import ContextVar
+from operator import attrgetter
+import html
+import importlib
+import importlib.util
 import json
+import re
 import uuid
-import hashlib
 
-# Import existing modules for integration
-try:
-    from aws_connector import get_aws_session, test_aws_connection
-    from landscape_scanner import (
-        AWSLandscapeScanner, 
-        Finding as ScannerFinding,
-        LandscapeAssessment,
-        generate_demo_assessment
-    )
-    from compliance_module import COMPLIANCE_FRAMEWORKS
-    AWS_INTEGRATION = True
-except ImportError:
-    AWS_INTEGRATION = False
+# Scanner and Anthropic integrations are imported on first use so that
+# browsing questions doesn't pay their import cost. The lookup (hit or miss)
+# is cached, so later calls are a dict hit rather than an import attempt.
+@cache
+def _optional_module(name: str):
+    """Import an optional integration module, or return None if it is missing"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
 
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+@cache
+def _module_available(name: str) -> bool:
+    """Whether an optional module is installed, checked without importing it"""
+    return importlib.util.find_spec(name) is not None
+
+def _get_landscape_scanner():
+    """Return the landscape_scanner module, or None if it is not available"""
+    return _optional_module("landscape_scanner")
+
+def _get_anthropic():
+    """Return the anthropic module, or None if it is not installed"""
+    return _optional_module("anthropic")
 
 # Portfolio Integration - Multi-Account Support
 try:
@@ -449,13 +462,36 @@ class WAFAutoDetector:
             'high_confidence': high_conf,
             'medium_confidence': med_conf,
             'low_confidence': low_conf,
-            'coverage_percentage': (len(auto_detected) / 205) * 100
+            'coverage_percentage': (len(auto_detected) / TOTAL_WAF_QUESTIONS) * 100
         }
 
 # ============================================================================
 # CORE DATA MODELS
 # ============================================================================
 
+# Effort phrases that mark an action item as a quick win, in one compiled pass
+# (case-insensitive and tolerant of spacing, e.g. "2 Hours" or "1hour")
+_QUICK_EFFORT_RE = re.compile(r"minutes|1\s*hour|2\s*hours|half\s*day", re.IGNORECASE)
+
+# Read-only lookup tables, consulted once per member when Pillar is created
+_PILLAR_ICONS = MappingProxyType({
+    "Operational Excellence": "⚙️",
+    "Security": "🔒",
+    "Reliability": "🛡️",
+    "Performance Efficiency": "⚡",
+    "Cost Optimization": "💰",
+    "Sustainability": "🌱"
+})
+
+_PILLAR_COLORS = MappingProxyType({
+    "Operational Excellence": "#FF9900",
+    "Security": "#EC7211",
+    "Reliability": "#146EB4",
+    "Performance Efficiency": "#9D5025",
+    "Cost Optimization": "#527FFF",
+    "Sustainability": "#3F8624"
+})
+
 class Pillar(Enum):
     """Six pillars of the AWS Well-Architected Framework"""
     OPERATIONAL_EXCELLENCE = "Operational Excellence"
@@ -465,29 +501,19 @@ class Pillar(Enum):
     COST_OPTIMIZATION = "Cost Optimization"
     SUSTAINABILITY = "Sustainability"
     
-    @property
-    def icon(self):
-        icons = {
-            "Operational Excellence": "⚙️",
-            "Security": "🔒",
-            "Reliability": "🛡️",
-            "Performance Efficiency": "⚡",
-            "Cost Optimization": "💰",
-            "Sustainability": "🌱"
-        }
-        return icons[self.value]
-    
-    @property
-    def color(self):
-        colors = {
-            "Operational Excellence": "#FF9900",
-            "Security": "#EC7211",
-            "Reliability": "#146EB4",
-            "Performance Efficiency": "#9D5025",
-            "Cost Optimization": "#527FFF",
-            "Sustainability": "#3F8624"
-        }
-        return colors[self.value]
+    def __init__(self, value):
+        # Resolved once per member so pillar.icon / pillar.color are plain attribute loads
+        self.icon = _PILLAR_ICONS[value]
+        self.color = _PILLAR_COLORS[value]
+
+# Pillars in definition order as a plain tuple, so per-rerun loops don't go
+# through the enum metaclass
+_PILLARS: Tuple[Pillar, ...] = tuple(Pillar)
+_PILLAR_VALUES: Tuple[str, ...] = tuple(p.value for p in _PILLARS)
+
+# Stable option sequences for selectboxes, built once instead of per rerun
+_PILLAR_FILTER_OPTIONS = ("All",) + _PILLAR_VALUES
+_ASSESSMENT_TYPES = ("Quick (30 min)", "Standard (2 hours)", "Comprehensive (1 day)")
 
 class RiskLevel(Enum):
     """Risk levels for findings"""
@@ -497,17 +523,13 @@ class RiskLevel(Enum):
     HIGH = ("High", "🔴", "#dc3545")
     CRITICAL = ("Critical", "🚨", "#8b0000")
     
-    @property
-    def label(self):
-        return self.value[0]
-    
-    @property
-    def icon(self):
-        return self.value[1]
-    
-    @property
-    def color(self):
-        return self.value[2]
+    def __init__(self, label, icon, color):
+        self.label = label
+        self.icon = icon
+        self.color = color
+
+# Risk levels an action item needs to qualify as a quick win
+_QUICK_WIN_LEVELS = frozenset({RiskLevel.HIGH, RiskLevel.MEDIUM})
 
 class AssessmentType(Enum):
     """Type of WAF assessment"""
@@ -516,7 +538,7 @@ class AssessmentType(Enum):
     COMPREHENSIVE = ("Comprehensive Review", "1-2 days", "200+ questions + automated scan")
     CONTINUOUS = ("Continuous Monitoring", "Ongoing", "Automated with periodic reviews")
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Choice:
     """Answer choice for a question"""
     id: str
@@ -524,29 +546,86 @@ class Choice:
     risk_level: RiskLevel
     points: int  # 0-100, higher is better
     guidance: str = ""
-    evidence_required: List[str] = field(default_factory=list)
+    evidence_required: Tuple[str, ...] = ()
     auto_detectable: bool = False
+    # Radio label, built once instead of on every rerun
+    choice_label: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'choice_label', f"{self.risk_level.icon} {self.text}")
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Question:
-    """Assessment question with metadata"""
+    """Assessment question with metadata (immutable, shared across sessions)"""
     id: str
     pillar: Pillar
     category: str
     text: str
     description: str
     why_important: str
-    best_practices: List[str]
-    choices: List[Choice]
+    best_practices: Tuple[str, ...]
+    choices: Tuple[Choice, ...]
     help_link: str
-    aws_services: List[str] = field(default_factory=list)
-    compliance_mappings: Dict[str, List[str]] = field(default_factory=dict)
+    aws_services: Tuple[str, ...] = ()
+    compliance_mappings: Dict[str, Tuple[str, ...]] = field(default_factory=dict, hash=False)
     automated_check: Optional[str] = None
-    required_for: List[str] = field(default_factory=list)
+    required_for: Tuple[str, ...] = ()
     maturity_level: int = 1  # 1=Foundation, 2=Intermediate, 3=Advanced
-    tags: List[str] = field(default_factory=list)
+    tags: Tuple[str, ...] = ()
+    # Render strings built once here: the escaped description can be inlined
+    # into raw HTML, and the title labels the question's expander
+    description_html: str = field(init=False, repr=False, compare=False)
+    title_label: str = field(init=False, repr=False, compare=False)
+    # choice id -> Choice, so scoring resolves an answer without scanning choices
+    _choices_by_id: Dict[str, Choice] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'description_html', html.escape(self.description))
+        object.__setattr__(self, 'title_label', f"{self.pillar.icon} {self.id}: {self.text}")
+        object.__setattr__(self, '_choices_by_id', {c.id: c for c in self.choices})
+
+def _parse_stored_datetime(value) -> Optional[datetime]:
+    """Accept a datetime, an ISO-8601 string, or None from stored data"""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+def _parse_stored_enum(enum_cls, value):
+    """Accept an enum member, its name, str(member), or its value from stored data"""
+    if isinstance(value, enum_cls):
+        return value
+    if isinstance(value, str):
+        # json.dumps(..., default=str) writes members as "ClassName.MEMBER"
+        name = value.removeprefix(f"{enum_cls.__name__}.")
+        if name in enum_cls.__members__:
+            return enum_cls[name]
+    # JSON turns tuple values (RiskLevel, AssessmentType) into lists
+    return enum_cls(tuple(value) if isinstance(value, list) else value)
 
-@dataclass
+# Timestamp pinned by _freeze_now for the current thread/context, if any.
+# A ContextVar rather than a module global, since Streamlit serves each
+# session on its own thread.
+_pinned_now: ContextVar[Optional[datetime]] = ContextVar('_pinned_now', default=None)
+
+def _now() -> datetime:
+    """Current time, or the timestamp pinned by an enclosing _freeze_now"""
+    return _pinned_now.get() or datetime.now()
+
+@contextmanager
+def _freeze_now(ts: Optional[datetime] = None):
+    """
+    Pin _now() to one timestamp for a bulk build, so the created_at,
+    updated_at and responded_at defaults share it instead of each
+    calling datetime.now().
+    """
+    ts = ts or datetime.now()
+    token = _pinned_now.set(ts)
+    try:
+        yield ts
+    finally:
+        _pinned_now.reset(token)
+
+@dataclass(slots=True)
 class Response:
     """User's response to a question"""
     question_id: str
@@ -556,12 +635,35 @@ class Response:
     evidence_files: List[str] = field(default_factory=list)
     automated_evidence: Dict[str, Any] = field(default_factory=dict)
     responded_by: str = ""
-    responded_at: datetime = field(default_factory=datetime.now)
+    responded_at: datetime = field(default_factory=_now)
     verified: bool = False
     verified_by: str = ""
     verified_at: Optional[datetime] = None
+    
+    @classmethod
+    def from_stored(cls, data: Dict, loaded_at: Optional[datetime] = None) -> Response:
+        """
+        Rebuild a Response from stored data, passing every field explicitly.
+        
+        Bulk loaders should pass one shared loaded_at; it is only used when a
+        record has no responded_at, so no per-record datetime.now() is made
+        (wrapping the loop in _freeze_now has the same effect).
+        """
+        return cls(
+            question_id=data['question_id'],
+            choice_id=data['choice_id'],
+            notes=data.get('notes', ""),
+            evidence_urls=list(data.get('evidence_urls', ())),
+            evidence_files=list(data.get('evidence_files', ())),
+            automated_evidence=dict(data.get('automated_evidence', {})),
+            responded_by=data.get('responded_by', ""),
+            responded_at=_parse_stored_datetime(data.get('responded_at')) or loaded_at or _now(),
+            verified=data.get('verified', False),
+            verified_by=data.get('verified_by', ""),
+            verified_at=_parse_stored_datetime(data.get('verified_at'))
+        )
 
-@dataclass
+@dataclass(slots=True)
 class ActionItem:
     """Remediation action item"""
     id: str
@@ -581,11 +683,25 @@ class ActionItem:
     due_date: Optional[datetime] = None
     completion_date: Optional[datetime] = None
     notes: str = ""
-    related_questions: List[str] = field(default_factory=list)
-    compliance_impact: List[str] = field(default_factory=list)
+    related_questions: Tuple[str, ...] = ()
+    compliance_impact: Tuple[str, ...] = ()
     progress: int = 0  # 0-100%
+    
+    @classmethod
+    def from_stored(cls, data: Dict) -> ActionItem:
+        """Rebuild an action item from stored data, restoring enums and datetimes"""
+        kwargs = {f.name: data[f.name] for f in fields(cls) if f.name in data}
+        kwargs['pillar'] = _parse_stored_enum(Pillar, data['pillar'])
+        kwargs['risk_level'] = _parse_stored_enum(RiskLevel, data['risk_level'])
+        for name in ('due_date', 'completion_date'):
+            if name in kwargs:
+                kwargs[name] = _parse_stored_datetime(kwargs[name])
+        for name in ('related_questions', 'compliance_impact'):
+            if name in kwargs:
+                kwargs[name] = tuple(kwargs[name])
+        return cls(**kwargs)
 
-@dataclass
+@dataclass(slots=True)
 class WAFAssessment:
     """Complete Well-Architected Framework Assessment"""
     # Identification
@@ -608,8 +724,8 @@ class WAFAssessment:
     stakeholders: List[str] = field(default_factory=list)
     
     # Timing
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
+    created_at: datetime = field(default_factory=_now)
+    updated_at: datetime = field(default_factory=_now)
     completed_at: Optional[datetime] = None
     review_date: Optional[datetime] = None
     next_review_date: Optional[datetime] = None
@@ -652,74 +768,176 @@ class WAFAssessment:
     tags: List[str] = field(default_factory=list)
     notes: str = ""
     
-    def calculate_score(self, questions: List[Question]) -> float:
-        """Calculate overall assessment score"""
+    @classmethod
+    def from_stored(cls, data: Dict) -> WAFAssessment:
+        """
+        Rebuild an assessment from stored data without firing the
+        datetime.now default factories once per assessment and response.
+        """
+        loaded_at = _now()
+        kwargs = {f.name: data[f.name] for f in fields(cls) if f.init and f.name in data}
+        
+        if 'assessment_type' in kwargs:
+            kwargs['assessment_type'] = _parse_stored_enum(AssessmentType, kwargs['assessment_type'])
+        
+        kwargs['created_at'] = _parse_stored_datetime(data.get('created_at')) or loaded_at
+        kwargs['updated_at'] = _parse_stored_datetime(data.get('updated_at')) or loaded_at
+        for name in ('completed_at', 'review_date', 'next_review_date',
+                     'scan_timestamp', 'ai_analysis_timestamp'):
+            if name in kwargs:
+                kwargs[name] = _parse_stored_datetime(kwargs[name])
+        
+        kwargs['responses'] = {
+            qid: resp if isinstance(resp, Response) else Response.from_stored(resp, loaded_at)
+            for qid, resp in data.get('responses', {}).items()
+        }
+        kwargs['action_items'] = [
+            item if isinstance(item, ActionItem) else ActionItem.from_stored(item)
+            for item in data.get('action_items', ())
+        ]
+        return cls(**kwargs)
+    
+    def _catalog_totals(self) -> Tuple[int, Dict[Pillar, int]]:
+        """Points earned over the full catalog, overall and per pillar, in one pass"""
+        by_id = get_questions_by_id()
+        total = 0
+        by_pillar = dict.fromkeys(_PILLARS, 0)
+        for question_id, response in self.responses.items():
+            question = by_id.get(question_id)
+            if question is not None:
+                choice = question._choices_by_id.get(response.choice_id)
+                if choice:
+                    total += choice.points
+                    by_pillar[question.pillar] += choice.points
+        return total, by_pillar
+    
+    def set_response(self, question: Question, response: Response) -> None:
+        """Record a response and refresh the stored scores"""
+        self.responses[question.id] = response
+        self.refresh_scores()
+    
+    def refresh_scores(self) -> None:
+        """
+        Store the overall, pillar and completion scores, rounded for
+        reporting once here rather than on every export.
+        """
+        # One walk over the responses yields the overall and every pillar total
+        total_points, points_by_pillar = self._catalog_totals()
+        self.overall_score = round(total_points / (TOTAL_WAF_QUESTIONS * 100) * 100, 1)
+        self.pillar_scores = {
+            p.value: round(points_by_pillar[p] / (_PILLAR_QUESTION_COUNTS[p.value] * 100) * 100, 1)
+            for p in _PILLARS
+        }
+        self.completion_percentage = round(len(self.responses) / TOTAL_WAF_QUESTIONS * 100, 1)
+    
+    def _risk_buckets(self) -> Dict[RiskLevel, List[ActionItem]]:
+        """
+        Action items grouped by risk level in a single pass, rebuilt on every
+        call: action_items is a public list of mutable items, so there is no
+        mutation hook to invalidate a stored copy.
+        """
+        buckets = {level: [] for level in RiskLevel}
+        for item in self.action_items:
+            buckets[item.risk_level].append(item)
+        return buckets
+    
+    def calculate_score(self, questions: List[Question],
+                        qmap: Optional[Dict[str, Question]] = None) -> float:
+        """
+        Calculate overall assessment score
+        
+        Walks the responses. Scoring against the full catalog uses its fixed
+        question count; for other question lists pass qmap ({question_id:
+        Question} for the same questions) to reuse one index across calls.
+        """
         if not self.responses:
             return 0.0
+        if qmap is None and questions is get_complete_waf_questions():
+            total_points, _ = self._catalog_totals()
+            return total_points / (TOTAL_WAF_QUESTIONS * 100) * 100
+        if qmap is None:
+            qmap = {q.id: q for q in questions}
         
         total_points = 0
-        max_points = 0
-        
-        for question in questions:
-            if question.id in self.responses:
-                response = self.responses[question.id]
-                choice = next((c for c in question.choices if c.id == response.choice_id), None)
+        for question_id, response in self.responses.items():
+            question = qmap.get(question_id)
+            if question is not None:
+                choice = question._choices_by_id.get(response.choice_id)
                 if choice:
                     total_points += choice.points
-            max_points += 100
         
+        max_points = len(questions) * 100
         return (total_points / max_points * 100) if max_points > 0 else 0.0
     
-    def calculate_pillar_score(self, pillar: Pillar, questions: List[Question]) -> float:
-        """Calculate score for specific pillar"""
-        pillar_questions = [q for q in questions if q.pillar == pillar]
-        if not pillar_questions:
+    def calculate_pillar_score(self, pillar: Pillar, questions: List[Question],
+                               qmap: Optional[Dict[str, Question]] = None) -> float:
+        """Calculate score for specific pillar (see calculate_score for qmap)"""
+        if qmap is None and questions is get_complete_waf_questions():
+            _, points_by_pillar = self._catalog_totals()
+            return points_by_pillar[pillar] / (_PILLAR_QUESTION_COUNTS[pillar.value] * 100) * 100
+        
+        pillar_total = sum(1 for q in questions if q.pillar is pillar)
+        if not pillar_total:
             return 0.0
+        if qmap is None:
+            qmap = {q.id: q for q in questions}
         
         total_points = 0
-        max_points = 0
-        
-        for question in pillar_questions:
-            if question.id in self.responses:
-                response = self.responses[question.id]
-                choice = next((c for c in question.choices if c.id == response.choice_id), None)
+        for question_id, response in self.responses.items():
+            question = qmap.get(question_id)
+            if question is not None and question.pillar is pillar:
+                choice = question._choices_by_id.get(response.choice_id)
                 if choice:
                     total_points += choice.points
-            max_points += 100
         
-        return (total_points / max_points * 100) if max_points > 0 else 0.0
+        return total_points / (pillar_total * 100) * 100
     
     def get_risk_items_by_level(self, level: RiskLevel) -> List[ActionItem]:
         """Get action items by risk level"""
-        return [item for item in self.action_items if item.risk_level == level]
+        return [item for item in self.action_items if item.risk_level is level]
     
     def get_high_priority_items(self) -> List[ActionItem]:
         """Get high priority action items"""
-        high_risk = self.get_risk_items_by_level(RiskLevel.HIGH)
-        critical_risk = self.get_risk_items_by_level(RiskLevel.CRITICAL)
-        return sorted(critical_risk + high_risk, key=lambda x: x.priority)
+        buckets = self._risk_buckets()
+        # The concatenation is already a fresh list, so sort it in place
+        items = buckets[RiskLevel.CRITICAL] + buckets[RiskLevel.HIGH]
+        items.sort(key=attrgetter('priority'))
+        return items
     
     def get_quick_wins(self) -> List[ActionItem]:
         """Get quick win opportunities"""
-        quick_efforts = ["minutes", "1 hour", "2 hours", "half day"]
+        # Cheapest tests first, so the effort regex only runs on candidates
         return [item for item in self.action_items
-                if any(effort in item.estimated_effort.lower() for effort in quick_efforts)
-                and item.risk_level in [RiskLevel.HIGH, RiskLevel.MEDIUM]
-                and item.status != "Completed"][:10]
+                if item.status != "Completed"
+                and item.risk_level in _QUICK_WIN_LEVELS
+                and _QUICK_EFFORT_RE.search(item.estimated_effort)][:10]
     
     def export_summary(self) -> Dict:
         """Export summary for reporting"""
+        # Count risk levels and quick wins in one walk over action_items
+        high = critical = quick = 0
+        for item in self.action_items:
+            risk_level = item.risk_level
+            if risk_level is RiskLevel.HIGH:
+                high += 1
+            elif risk_level is RiskLevel.CRITICAL:
+                critical += 1
+            if (quick < 10 and item.status != "Completed"
+                    and risk_level in _QUICK_WIN_LEVELS
+                    and _QUICK_EFFORT_RE.search(item.estimated_effort)):
+                quick += 1
+        
         return {
             'id': self.id,
             'workload': self.workload_name,
             'organization': self.organization_name,
             'environment': self.environment,
-            'overall_score': round(self.overall_score, 1),
-            'completion': round(self.completion_percentage, 1),
-            'pillar_scores': {k: round(v, 1) for k, v in self.pillar_scores.items()},
-            'high_risk_count': len(self.get_risk_items_by_level(RiskLevel.HIGH)),
-            'critical_risk_count': len(self.get_risk_items_by_level(RiskLevel.CRITICAL)),
-            'quick_wins': len(self.get_quick_wins()),
+            'overall_score': self.overall_score,
+            'completion': self.completion_percentage,
+            'pillar_scores': dict(self.pillar_scores),
+            'high_risk_count': high,
+            'critical_risk_count': critical,
+            'quick_wins': quick,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
@@ -728,10 +946,122 @@ class WAFAssessment:
 # COMPLETE QUESTION DATABASE - ALL 6 PILLARS (200+ QUESTIONS)
 # ============================================================================
 
-def get_complete_waf_questions() -> List[Question]:
+# Templates for the generated question catalog. The category-dependent ones are
+# formatted once per category in add_questions rather than once per question.
+# Question text templates, filled with str.format_map from one context dict
+_CATEGORY_TMPL = "{category_base} - Area {i}"
+_TEXT_TMPL = "How do you implement {category} best practices (Area {i})?"
+_DESC_TMPL = "Implement comprehensive {category} practices to ensure workload excellence. This covers specific aspects of {category} that are critical for your architecture."
+_WHY_TMPL = "{category_base} is essential for workload success. This area specifically addresses key aspects that impact reliability, security, performance, cost, and sustainability."
+_HELP_LINK_TMPL = "https://docs.aws.amazon.com/wellarchitected/latest/framework/{pillar_slug}.html"
+
+_BEST_PRACTICES_TMPL = (
+    "Implement {category} controls and policies",
+    "Use automation to enforce {category} standards",
+    "Monitor and measure {category} effectiveness",
+    "Conduct regular reviews and improvements of {category}"
+)
+_GUIDANCE_TMPL_A = "Excellent! Your implementation follows AWS best practices. Continue to monitor, measure, and improve."
+_GUIDANCE_TMPL_B = "Good foundation. Focus on increasing automation, enhancing monitoring, and establishing regular review cycles."
+_GUIDANCE_TMPL_C = "Document your practices, implement automated controls, establish monitoring, and create a review schedule."
+_GUIDANCE_TMPL_D = "CRITICAL: Immediately implement {category} controls. This is a significant risk to your workload."
+
+# (id suffix, text template, risk level, points, guidance template) for the four
+# answer choices every generated question offers, best to worst
+_CHOICE_TEMPLATES = (
+    ("A", "Comprehensive {category} implementation with full automation, continuous monitoring, documented procedures, and regular reviews",
+     RiskLevel.NONE, 100, _GUIDANCE_TMPL_A),
+    ("B", "Good {category} practices in place with some automation, basic monitoring, and documented procedures",
+     RiskLevel.LOW, 70, _GUIDANCE_TMPL_B),
+    ("C", "Basic {category} implementation with manual processes, limited monitoring, and inconsistent application",
+     RiskLevel.MEDIUM, 40, _GUIDANCE_TMPL_C),
+    ("D", "No formal {category} process, ad-hoc approach, or unaware of requirements",
+     RiskLevel.HIGH, 0, _GUIDANCE_TMPL_D),
+)
+
+# Shared by every generated question; never mutated after construction
+_DEFAULT_AWS_SERVICES = ("CloudWatch", "CloudTrail", "Config", "Systems Manager")
+# Copied into each question with dict(), so no question can alter another's
+# mapping and questions stay picklable (unlike a shared mappingproxy)
+_DEFAULT_COMPLIANCE = (
+    ("iso27001", ("A.12.1", "A.18.1")),
+    ("soc2", ("CC7.1", "CC7.2")),
+    ("pci_dss", ("12.1",)),
+    ("hipaa", ("164.308",))
+)
+
+# (id prefix, pillar, category, question count) for every generated category,
+# in catalog order. Counting from this table gives the catalog size without
+# building it.
+_CATALOG_LAYOUT = (
+    # ========================================================================
+    # OPERATIONAL EXCELLENCE - 40 Questions
+    # ========================================================================
+    ("OPS-ORG", Pillar.OPERATIONAL_EXCELLENCE, "Organization", 8),
+    ("OPS-PREP", Pillar.OPERATIONAL_EXCELLENCE, "Prepare", 12),
+    ("OPS-OPER", Pillar.OPERATIONAL_EXCELLENCE, "Operate", 12),
+    ("OPS-EVOLVE", Pillar.OPERATIONAL_EXCELLENCE, "Evolve", 8),
+    
+    # ========================================================================
+    # SECURITY - 50 Questions
+    # ========================================================================
+    ("SEC-IAM", Pillar.SECURITY, "Identity & Access Management", 10),
+    ("SEC-DET", Pillar.SECURITY, "Detection", 10),
+    ("SEC-INFRA", Pillar.SECURITY, "Infrastructure Protection", 10),
+    ("SEC-DATA", Pillar.SECURITY, "Data Protection", 15),
+    ("SEC-IR", Pillar.SECURITY, "Incident Response", 5),
+    
+    # ========================================================================
+    # RELIABILITY - 40 Questions
+    # ========================================================================
+    ("REL-FOUND", Pillar.RELIABILITY, "Foundations", 10),
+    ("REL-ARCH", Pillar.RELIABILITY, "Workload Architecture", 12),
+    ("REL-CHANGE", Pillar.RELIABILITY, "Change Management", 10),
+    ("REL-FAIL", Pillar.RELIABILITY, "Failure Management", 8),
+    
+    # ========================================================================
+    # PERFORMANCE EFFICIENCY - 30 Questions
+    # ========================================================================
+    ("PERF-SEL", Pillar.PERFORMANCE_EFFICIENCY, "Selection", 10),
+    ("PERF-REV", Pillar.PERFORMANCE_EFFICIENCY, "Review", 8),
+    ("PERF-MON", Pillar.PERFORMANCE_EFFICIENCY, "Monitoring", 8),
+    ("PERF-TRADE", Pillar.PERFORMANCE_EFFICIENCY, "Tradeoffs", 4),
+    
+    # ========================================================================
+    # COST OPTIMIZATION - 30 Questions
+    # ========================================================================
+    ("COST-CFM", Pillar.COST_OPTIMIZATION, "Cloud Financial Management", 6),
+    ("COST-AWARE", Pillar.COST_OPTIMIZATION, "Expenditure Awareness", 8),
+    ("COST-RES", Pillar.COST_OPTIMIZATION, "Cost-Effective Resources", 10),
+    ("COST-DEMAND", Pillar.COST_OPTIMIZATION, "Manage Demand", 3),
+    ("COST-OPT", Pillar.COST_OPTIMIZATION, "Optimize Over Time", 3),
+    
+    # ========================================================================
+    # SUSTAINABILITY - 15 Questions
+    # ========================================================================
+    ("SUS-REG", Pillar.SUSTAINABILITY, "Region Selection", 3),
+    ("SUS-USER", Pillar.SUSTAINABILITY, "User Behavior", 3),
+    ("SUS-SOFT", Pillar.SUSTAINABILITY, "Software & Architecture", 3),
+    ("SUS-DATA", Pillar.SUSTAINABILITY, "Data", 3),
+    ("SUS-HARD", Pillar.SUSTAINABILITY, "Hardware & Services", 2),
+    ("SUS-DEV", Pillar.SUSTAINABILITY, "Development", 1),
+)
+TOTAL_WAF_QUESTIONS = sum(count for *_, count in _CATALOG_LAYOUT)
+_PILLAR_BY_PREFIX = {prefix: pillar.value for prefix, pillar, *_ in _CATALOG_LAYOUT}
+_PILLAR_QUESTION_COUNTS = {
+    p.value: sum(count for _, pillar, _, count in _CATALOG_LAYOUT if pillar is p) for p in Pillar
+}
+
+# The catalog is always built in-process: unpickling it from disk measured no
+# faster than constructing it (~3 ms either way), so a .pkl warm-start cache
+# would only add file I/O and a staleness check.
+@cache
+def get_complete_waf_questions() -> Tuple[Question, ...]:
     """
     Complete AWS Well-Architected Framework Question Database - ALL 205 QUESTIONS
     
+    Built once per process; every caller shares the same immutable tuple.
+    
     Comprehensive coverage across all 6 pillars:
     - Operational Excellence: 40 questions (Organization, Prepare, Operate, Evolve)
     - Security: 50 questions (IAM, Detection, Infrastructure, Data Protection, Incident Response)
@@ -749,124 +1079,171 @@ def get_complete_waf_questions() -> List[Question]:
     - Auto-detection capabilities where applicable
     """
     
-    questions = []
-    
     # Helper function to generate questions efficiently
-    def add_questions(prefix, pillar, category_base, count, start=1):
-        """Generate questions for a category"""
-        for i in range(start, start + count):
+    def add_questions(prefix, pillar, category_base, count, start=1) -> List[Question]:
+        """Generate the questions for a category"""
+        cat_lower = category_base.lower()
+        template_ctx = {
+            'category': cat_lower,
+            'category_base': category_base,
+            'pillar_slug': pillar.value.lower().replace(' ', '-')
+        }
+        # Per-category strings; only the category label and text vary by question
+        description = _DESC_TMPL.format_map(template_ctx)
+        why_important = _WHY_TMPL.format_map(template_ctx)
+        help_link = _HELP_LINK_TMPL.format_map(template_ctx)
+        automated_check = f"aws_config_{cat_lower.replace(' ', '_')}"
+        best_practices = tuple(tmpl.format_map(template_ctx) for tmpl in _BEST_PRACTICES_TMPL)
+        # Choice text and guidance only vary by category, so format them once here
+        choice_specs = tuple(
+            (suffix, text.format_map(template_ctx), risk_level, points, guidance.format_map(template_ctx))
+            for suffix, text, risk_level, points, guidance in _CHOICE_TEMPLATES
+        )
+        tags = (cat_lower.replace(" ", "-"), prefix.lower().split("-")[0])
+        
+        def build(i):
             q_num = f"{i:03d}"
             q_id = f"{prefix}-{q_num}"
+            template_ctx['i'] = i
             
-            questions.append(Question(
+            return Question(
                 id=q_id,
                 pillar=pillar,
-                category=f"{category_base} - Area {i}",
-                text=f"How do you implement {category_base.lower()} best practices (Area {i})?",
-                description=f"Implement comprehensive {category_base.lower()} practices to ensure workload excellence. This covers specific aspects of {category_base.lower()} that are critical for your architecture.",
-                why_important=f"{category_base} is essential for workload success. This area specifically addresses key aspects that impact reliability, security, performance, cost, and sustainability.",
-                best_practices=[
-                    f"Implement {category_base.lower()} controls and policies",
-                    f"Use automation to enforce {category_base.lower()} standards",
-                    f"Monitor and measure {category_base.lower()} effectiveness",
-                    f"Conduct regular reviews and improvements of {category_base.lower()}"
-                ],
-                choices=[
+                category=_CATEGORY_TMPL.format_map(template_ctx),
+                text=_TEXT_TMPL.format_map(template_ctx),
+                description=description,
+                why_important=why_important,
+                best_practices=best_practices,
+                choices=tuple(
                     Choice(
-                        id=f"{q_id}-A",
-                        text=f"Comprehensive {category_base.lower()} implementation with full automation, continuous monitoring, documented procedures, and regular reviews",
-                        risk_level=RiskLevel.NONE,
-                        points=100,
-                        guidance="Excellent! Your implementation follows AWS best practices. Continue to monitor, measure, and improve."
-                    ),
-                    Choice(
-                        id=f"{q_id}-B",
-                        text=f"Good {category_base.lower()} practices in place with some automation, basic monitoring, and documented procedures",
-                        risk_level=RiskLevel.LOW,
-                        points=70,
-                        guidance="Good foundation. Focus on increasing automation, enhancing monitoring, and establishing regular review cycles."
-                    ),
-                    Choice(
-                        id=f"{q_id}-C",
-                        text=f"Basic {category_base.lower()} implementation with manual processes, limited monitoring, and inconsistent application",
-                        risk_level=RiskLevel.MEDIUM,
-                        points=40,
-                        guidance="Document your practices, implement automated controls, establish monitoring, and create a review schedule."
-                    ),
-                    Choice(
-                        id=f"{q_id}-D",
-                        text=f"No formal {category_base.lower()} process, ad-hoc approach, or unaware of requirements",
-                        risk_level=RiskLevel.HIGH,
-                        points=0,
-                        guidance=f"CRITICAL: Immediately implement {category_base.lower()} controls. This is a significant risk to your workload."
+                        id=f"{q_id}-{suffix}",
+                        text=text,
+                        risk_level=risk_level,
+                        points=points,
+                        guidance=guidance
                     )
-                ],
-                help_link=f"https://docs.aws.amazon.com/wellarchitected/latest/framework/{pillar.value.lower().replace(' ', '-')}.html",
-                aws_services=["CloudWatch", "CloudTrail", "Config", "Systems Manager"],
-                compliance_mappings={
-                    "iso27001": ["A.12.1", "A.18.1"],
-                    "soc2": ["CC7.1", "CC7.2"],
-                    "pci_dss": ["12.1"],
-                    "hipaa": ["164.308"]
-                },
-                automated_check=f"aws_config_{category_base.lower().replace(' ', '_')}" if (i % 3 == 0) else None,
+                    for suffix, text, risk_level, points, guidance in choice_specs
+                ),
+                help_link=help_link,
+                aws_services=_DEFAULT_AWS_SERVICES,
+                compliance_mappings=dict(_DEFAULT_COMPLIANCE),
+                automated_check=automated_check if (i % 3 == 0) else None,
                 maturity_level=2 if i > count//2 else 1,
-                tags=[category_base.lower().replace(" ", "-"), prefix.lower().split("-")[0]]
-            ))
-    
-    # ========================================================================
-    # OPERATIONAL EXCELLENCE - 40 Questions
-    # ========================================================================
-    add_questions("OPS-ORG", Pillar.OPERATIONAL_EXCELLENCE, "Organization", 8)
-    add_questions("OPS-PREP", Pillar.OPERATIONAL_EXCELLENCE, "Prepare", 12)
-    add_questions("OPS-OPER", Pillar.OPERATIONAL_EXCELLENCE, "Operate", 12)
-    add_questions("OPS-EVOLVE", Pillar.OPERATIONAL_EXCELLENCE, "Evolve", 8)
-    
-    # ========================================================================
-    # SECURITY - 50 Questions
-    # ========================================================================
-    add_questions("SEC-IAM", Pillar.SECURITY, "Identity & Access Management", 10)
-    add_questions("SEC-DET", Pillar.SECURITY, "Detection", 10)
-    add_questions("SEC-INFRA", Pillar.SECURITY, "Infrastructure Protection", 10)
-    add_questions("SEC-DATA", Pillar.SECURITY, "Data Protection", 15)
-    add_questions("SEC-IR", Pillar.SECURITY, "Incident Response", 5)
+                tags=tags
+            )
+        
+        return [build(i) for i in range(start, start + count)]
     
-    # ========================================================================
-    # RELIABILITY - 40 Questions
-    # ========================================================================
-    add_questions("REL-FOUND", Pillar.RELIABILITY, "Foundations", 10)
-    add_questions("REL-ARCH", Pillar.RELIABILITY, "Workload Architecture", 12)
-    add_questions("REL-CHANGE", Pillar.RELIABILITY, "Change Management", 10)
-    add_questions("REL-FAIL", Pillar.RELIABILITY, "Failure Management", 8)
+    questions: List[Question] = []
+    for prefix, pillar, category_base, count in _CATALOG_LAYOUT:
+        questions.extend(add_questions(prefix, pillar, category_base, count))
     
-    # ========================================================================
-    # PERFORMANCE EFFICIENCY - 30 Questions
-    # ========================================================================
-    add_questions("PERF-SEL", Pillar.PERFORMANCE_EFFICIENCY, "Selection", 10)
-    add_questions("PERF-REV", Pillar.PERFORMANCE_EFFICIENCY, "Review", 8)
-    add_questions("PERF-MON", Pillar.PERFORMANCE_EFFICIENCY, "Monitoring", 8)
-    add_questions("PERF-TRADE", Pillar.PERFORMANCE_EFFICIENCY, "Tradeoffs", 4)
-    
-    # ========================================================================
-    # COST OPTIMIZATION - 30 Questions
-    # ========================================================================
-    add_questions("COST-CFM", Pillar.COST_OPTIMIZATION, "Cloud Financial Management", 6)
-    add_questions("COST-AWARE", Pillar.COST_OPTIMIZATION, "Expenditure Awareness", 8)
-    add_questions("COST-RES", Pillar.COST_OPTIMIZATION, "Cost-Effective Resources", 10)
-    add_questions("COST-DEMAND", Pillar.COST_OPTIMIZATION, "Manage Demand", 3)
-    add_questions("COST-OPT", Pillar.COST_OPTIMIZATION, "Optimize Over Time", 3)
+    return tuple(questions)
+
+@cache
+def get_questions_by_id() -> Dict[str, Question]:
+    """Question lookup by id, built once per process"""
+    return {q.id: q for q in get_complete_waf_questions()}
+
+@cache
+def get_questions_by_pillar() -> Dict[Pillar, Tuple[Question, ...]]:
+    """Questions grouped by pillar in catalog order, built once per process"""
+    questions = get_complete_waf_questions()
+    return {p: tuple(q for q in questions if q.pillar is p) for p in Pillar}
+
+@cache
+def _questions_index() -> Dict[str, Tuple[Question, ...]]:
+    """Questions keyed by pillar value (plus "All") for the pillar filter"""
+    index = {p.value: qs for p, qs in get_questions_by_pillar().items()}
+    index["All"] = get_complete_waf_questions()
+    return index
+
+@lru_cache(maxsize=1)
+def _questions_by_compliance() -> Dict[Tuple[str, str], Tuple[str, ...]]:
+    """Inverted index of (framework, control) -> question ids, built once"""
+    idx = defaultdict(list)
+    for question in get_complete_waf_questions():
+        for framework, controls in question.compliance_mappings.items():
+            for control in controls:
+                idx[(framework, control)].append(question.id)
+    return {key: tuple(ids) for key, ids in idx.items()}
+
+def get_questions_for_control(framework: str, control_id: str) -> Tuple[str, ...]:
+    """Get ids of questions mapped to a compliance control, e.g. ("soc2", "CC7.1")"""
+    return _questions_by_compliance().get((framework, control_id), ())
+
+# ============================================================================
+# RESPONSE AGGREGATES - per-pillar answered counts and points
+# ============================================================================
+
+def _pillar_of(question_id: str) -> Optional[str]:
+    """Pillar value for a generated question id such as "SEC-IAM-003" """
+    return _PILLAR_BY_PREFIX.get(question_id.rpartition('-')[0])
+
+def _aggregate_entry(assessment: Dict) -> Tuple[Dict, Optional[Dict]]:
+    """The assessment's responses and its session-held aggregate entry, if any"""
+    responses = assessment.get('responses', {})
+    views = st.session_state.setdefault('_response_aggregates', {})
+    entry = views.get(assessment.get('id'))
+    # The entry pins the dict it was built from, so a reloaded or replaced
+    # responses dict (e.g. fresh from Firebase) never reuses stale totals
+    if entry is not None and entry['responses'] is not responses:
+        entry = None
+    return responses, entry
+
+def get_response_aggregates(assessment: Dict) -> Dict[str, Any]:
+    """
+    Per-pillar answered counts and points for an assessment dict.
     
-    # ========================================================================
-    # SUSTAINABILITY - 15 Questions
-    # ========================================================================
-    add_questions("SUS-REG", Pillar.SUSTAINABILITY, "Region Selection", 3)
-    add_questions("SUS-USER", Pillar.SUSTAINABILITY, "User Behavior", 3)
-    add_questions("SUS-SOFT", Pillar.SUSTAINABILITY, "Software & Architecture", 3)
-    add_questions("SUS-DATA", Pillar.SUSTAINABILITY, "Data", 3)
-    add_questions("SUS-HARD", Pillar.SUSTAINABILITY, "Hardware & Services", 2)
-    add_questions("SUS-DEV", Pillar.SUSTAINABILITY, "Development", 1)
+    Held in session state, never in the assessment itself, so the totals
+    are not persisted or exported. Updated on each save by
+    record_response_aggregate(); rebuilt from the responses when missing,
+    built from a different responses dict, or out of step with its count.
+    """
+    responses, entry = _aggregate_entry(assessment)
+    if entry is None or entry['answered'] != len(responses):
+        counts = dict.fromkeys(_PILLAR_QUESTION_COUNTS, 0)
+        points = dict.fromkeys(_PILLAR_QUESTION_COUNTS, 0)
+        for question_id, response in responses.items():
+            pillar_value = _pillar_of(question_id)
+            if pillar_value is not None:
+                counts[pillar_value] += 1
+                points[pillar_value] += response.get('points', 0)
+        entry = {'responses': responses, 'answered': len(responses), 'counts': counts, 'points': points}
+        st.session_state._response_aggregates[assessment.get('id')] = entry
+    return entry
+
+def record_response_aggregate(assessment: Dict, question_id: str, old_response: Optional[Dict], new_response: Dict):
+    """
+    Fold one saved response into the session-held aggregates.
     
-    return questions
+    Call after the new response has been stored, passing the response it
+    replaced (or None), so the pillar totals move by the difference only.
+    """
+    responses, entry = _aggregate_entry(assessment)
+    if entry is None:
+        return
+    if entry['answered'] != len(responses) - (old_response is None):
+        # Already out of step: let the next read rebuild it
+        st.session_state._response_aggregates.pop(assessment.get('id'), None)
+        return
+    pillar_value = _pillar_of(question_id)
+    if pillar_value is not None:
+        if old_response is None:
+            entry['counts'][pillar_value] += 1
+        else:
+            entry['points'][pillar_value] -= old_response.get('points', 0)
+        entry['points'][pillar_value] += new_response.get('points', 0)
+    if old_response is None:
+        entry['answered'] += 1
+
+def _aggregate_pillar_scores(assessment: Dict) -> Dict[str, float]:
+    """Pillar scores (0-100) from the running aggregates, same formula as the scoring helper"""
+    points = get_response_aggregates(assessment)['points']
+    return {
+        pillar_value: round(points[pillar_value] / total, 1)
+        for pillar_value, total in _PILLAR_QUESTION_COUNTS.items()
+    }
 
 # ============================================================================
 # MAIN RENDERING FUNCTION
@@ -876,7 +1253,8 @@ def run_aws_scan(assessment: Dict):
     """Run AWS scan and auto-detect WAF answers"""
     with st.spinner("🔍 Scanning AWS environment... This may take 1-2 minutes"):
         try:
-            if AWS_INTEGRATION:
+            landscape_scanner = _get_landscape_scanner()
+            if landscape_scanner:
                 # Get AWS session from session state
                 session = st.session_state.get('aws_session')
                 
@@ -886,7 +1264,7 @@ def run_aws_scan(assessment: Dict):
                     scan_results = generate_demo_scan_results()
                 else:
                     # Try real AWS scan with valid session
-                    scanner = AWSLandscapeScanner(session)
+                    scanner = landscape_scanner.AWSLandscapeScanner(session)
                     # Get default regions or use specified regions
                     regions = st.session_state.get('aws_regions', ['us-east-1'])
                     
@@ -954,8 +1332,9 @@ def run_aws_scan(assessment: Dict):
             # Update assessment
             assessment['scan_results'] = scan_results
             assessment['auto_detected'] = auto_detected
-            assessment['scan_completed_at'] = datetime.now().isoformat()
-            assessment['updated_at'] = datetime.now().isoformat()
+            now_iso = datetime.now().isoformat()
+            assessment['scan_completed_at'] = now_iso
+            assessment['updated_at'] = now_iso
             
             st.success(f"✅ Scan complete! Auto-detected {len(auto_detected)} questions.")
             st.rerun()
@@ -971,8 +1350,9 @@ def run_aws_scan(assessment: Dict):
             
             assessment['scan_results'] = scan_results
             assessment['auto_detected'] = auto_detected
-            assessment['scan_completed_at'] = datetime.now().isoformat()
-            assessment['updated_at'] = datetime.now().isoformat()
+            now_iso = datetime.now().isoformat()
+            assessment['scan_completed_at'] = now_iso
+            assessment['updated_at'] = now_iso
             
             st.rerun()
 
@@ -1022,20 +1402,23 @@ def generate_demo_scan_results() -> Dict:
 # TAB RENDERING FUNCTIONS
 # ============================================================================
 
+# Hub banner; static, so it is built once at import
+_HEADER_HTML = """
+<div style="background: linear-gradient(135deg, #FF9900 0%, #EC7211 100%); 
+            padding: 2rem; border-radius: 12px; margin-bottom: 2rem;">
+    <h2 style="color: white; margin: 0;">🏗️ AWS Well-Architected Assessment Hub</h2>
+    <p style="color: white; opacity: 0.9; margin: 0.5rem 0 0 0;">
+        Complete WAF assessments with AI assistance, automated scanning, and comprehensive reporting
+    </p>
+</div>
+"""
+
 def render_waf_review_tab():
     """
     Main rendering function for the WAF Assessment Hub.
     This consolidates: AWS Scanner + WAF Review + WAF Results into one integrated experience.
     """
-    st.markdown("""
-    <div style="background: linear-gradient(135deg, #FF9900 0%, #EC7211 100%); 
-                padding: 2rem; border-radius: 12px; margin-bottom: 2rem;">
-        <h2 style="color: white; margin: 0;">🏗️ AWS Well-Architected Assessment Hub</h2>
-        <p style="color: white; opacity: 0.9; margin: 0.5rem 0 0 0;">
-            Complete WAF assessments with AI assistance, automated scanning, and comprehensive reporting
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     # Initialize session state
     if 'waf_assessments' not in st.session_state:
@@ -1066,12 +1449,21 @@ def render_waf_review_tab():
         except Exception as e:
             # If Firebase not available, just use empty dict
             st.session_state.waf_assessments = {}
-    
-    if 'current_waf_assessment_id' not in st.session_state:
-        st.session_state.current_waf_assessment_id = None
-    
-    # Main Hub Navigation
-    current_assessment_id = st.session_state.current_waf_assessment_id
+        
+        # LOAD LISTING ROWS FROM THE LOCAL STORE when Firebase is not in use;
+        # full assessments are fetched one at a time as they are opened
+        if not st.session_state.get('firebase_initialized', False):
+            from local_assessment_store import list_local_assessments
+            success, message, local_assessments = list_local_assessments()
+            if not success:
+                st.warning(f"⚠️ Could not load saved assessments: {message}")
+            elif local_assessments:
+                st.session_state.waf_assessments = {a['id']: a for a in local_assessments}
+    
+    # Main Hub Navigation: look the open assessment up once and hand it down
+    assessments = st.session_state.waf_assessments
+    current_assessment_id = st.session_state.setdefault('current_waf_assessment_id', None)
+    current_assessment = _full_assessment(current_assessment_id) if current_assessment_id else None
     
     # Hub-level tabs (main sections of the hub)
     hub_tabs = st.tabs([
@@ -1083,10 +1475,10 @@ def render_waf_review_tab():
     
     with hub_tabs[0]:
         # My Assessments section - shows list or active assessment
-        if not current_assessment_id or current_assessment_id not in st.session_state.waf_assessments:
-            render_assessments_list()
+        if current_assessment is None:
+            render_assessments_list(assessments)
         else:
-            render_assessment_workspace()
+            render_assessment_workspace(current_assessment)
     
     with hub_tabs[1]:
         # Quick Scan - standalone scanning without assessment
@@ -1100,15 +1492,61 @@ def render_waf_review_tab():
         # Compliance View - integrated compliance from WAF data
         render_compliance_view()
 
-def render_assessments_list():
+def _load_full_assessment(assessment: Dict) -> Optional[Dict]:
+    """The full assessment for a held entry, reading it from the local store if it is a listing row"""
+    if not assessment.get('_summary'):
+        return assessment
+    from local_assessment_store import load_local_assessment
+    success, message, full = load_local_assessment(assessment['id'])
+    if not success:
+        st.warning(f"⚠️ Could not load assessment: {message}")
+    return full
+
+def _full_assessment(assessment_id: str) -> Optional[Dict]:
+    """Open an assessment: swap its listing row in session state for the full record"""
+    assessments = st.session_state.waf_assessments
+    assessment = assessments.get(assessment_id)
+    if assessment is None or not assessment.get('_summary'):
+        return assessment
+    full = _load_full_assessment(assessment)
+    if full is not None:
+        assessments[assessment_id] = full
+    return full
+
+def _collection_count(assessment: Dict, name: str) -> int:
+    """Size of a collection such as 'action_items', from a full record or a listing row"""
+    if assessment.get('_summary'):
+        return assessment.get(f'{name}_count', 0)
+    return len(assessment.get(name) or ())
+
+@st.dialog("Confirm delete")
+def _confirm_delete(assessment_id: str):
+    """Modal confirmation before an assessment is removed"""
+    assessment = st.session_state.waf_assessments.get(assessment_id, {})
+    st.markdown(f"Delete **{assessment.get('name', 'Unnamed Assessment')}**? This cannot be undone.")
+    
+    col_yes, col_no = st.columns(2)
+    with col_yes:
+        if st.button("🗑️ Delete", key="confirm_delete_yes", type="primary", use_container_width=True):
+            st.session_state.waf_assessments.pop(assessment_id, None)
+            if not st.session_state.get('firebase_initialized', False):
+                from local_assessment_store import delete_local_assessment
+                success, message = delete_local_assessment(assessment_id)
+                if not success:
+                    st.warning(f"⚠️ Removed from this session only: {message}")
+            # Full rerun: closes the dialog and drops the row from the list
+            st.rerun()
+    with col_no:
+        if st.button("Cancel", key="confirm_delete_no", use_container_width=True):
+            st.rerun()
+
+def render_assessments_list(assessments: Dict):
     """Render the list of all assessments with creation option"""
     col1, col2 = st.columns([2, 1])
     
     with col1:
         st.markdown("### 📋 Your WAF Assessments")
         
-        assessments = st.session_state.waf_assessments
-        
         if not assessments:
             st.info("👋 No assessments yet. Create your first comprehensive WAF assessment with AI assistance and automated scanning!")
         else:
@@ -1119,60 +1557,64 @@ def render_assessments_list():
                 reverse=True
             )
             
+            # One selectable table instead of a row of columns and buttons per assessment
+            import pandas as pd
+            
+            assessment_ids = []
+            rows = []
             for assessment_id, assessment in sorted_assessments:
-                with st.container():
-                    col_a, col_b, col_c, col_d = st.columns([4, 1, 1, 1])
-                    
-                    with col_a:
-                        # ⭐ Show portfolio icon for multi-account assessments
-                        is_portfolio = assessment.get('is_portfolio', False)
-                        portfolio_icon = "🏢" if is_portfolio else ""
-                        
-                        status_icon = "✅" if assessment.get('status') == 'completed' else "🔄"
-                        st.markdown(f"{status_icon} {portfolio_icon} **{assessment.get('name', 'Unnamed Assessment')}**")
-                        
-                        # Show key metrics
-                        progress = assessment.get('progress', 0)
-                        score = assessment.get('overall_score', 0)
-                        auto_detected = len(assessment.get('auto_detected', {}))
-                        
-                        metric_text = f"Progress: {progress}%"
-                        if score > 0:
-                            metric_text += f" | Score: {score:.0f}/100"
-                        if auto_detected > 0:
-                            metric_text += f" | ✅ {auto_detected} auto-detected"
-                        
-                        # ⭐ Show account count for portfolios
-                        if is_portfolio:
-                            accounts = assessment.get('accounts', [])
-                            metric_text += f" | 🏢 {len(accounts)} accounts"
-                        
-                        st.caption(f"Created: {assessment.get('created_at', 'Unknown')[:10]} | {metric_text}")
-                    
-                    with col_b:
-                        if st.button("📖 Open", key=f"open_{assessment_id}", use_container_width=True):
+                # ⭐ Show portfolio icon and account count for multi-account assessments
+                is_portfolio = assessment.get('is_portfolio', False)
+                assessment_ids.append(assessment_id)
+                rows.append({
+                    'Status': "✅" if assessment.get('status') == 'completed' else "🔄",
+                    'Assessment': f"{'🏢 ' if is_portfolio else ''}{assessment.get('name', 'Unnamed Assessment')}",
+                    'Created': assessment.get('created_at', 'Unknown')[:10],
+                    'Progress': assessment.get('progress', 0),
+                    'Score': assessment.get('overall_score', 0),
+                    'Auto-detected': _collection_count(assessment, 'auto_detected'),
+                    'Accounts': _collection_count(assessment, 'accounts') if is_portfolio else None
+                })
+            
+            event = st.dataframe(
+                pd.DataFrame(rows),
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'Status': st.column_config.TextColumn(width="small"),
+                    'Assessment': st.column_config.TextColumn(width="large"),
+                    'Progress': st.column_config.ProgressColumn(min_value=0, max_value=100, format="%.0f%%"),
+                    'Score': st.column_config.NumberColumn(format="%.0f/100")
+                },
+                on_select="rerun",
+                selection_mode="single-row",
+                key="assessments_table"
+            )
+            
+            # Actions for the selected row (the selection can outlive a deleted row)
+            selected_rows = [i for i in event.selection.rows if i < len(assessment_ids)]
+            if not selected_rows:
+                st.caption("Select an assessment to open, report on or delete it")
+            else:
+                assessment_id = assessment_ids[selected_rows[0]]
+                assessment = assessments[assessment_id]
+                col_b, col_c, col_d = st.columns(3)
+                
+                with col_b:
+                    if st.button("📖 Open", key="open_selected", use_container_width=True):
+                        st.session_state.current_waf_assessment_id = assessment_id
+                        st.rerun()
+                
+                with col_c:
+                    if assessment.get('status') == 'completed' or assessment.get('progress', 0) >= 80:
+                        if st.button("📄 Report", key="report_selected", use_container_width=True):
                             st.session_state.current_waf_assessment_id = assessment_id
+                            st.session_state.show_report = True
                             st.rerun()
-                    
-                    with col_c:
-                        if assessment.get('status') == 'completed' or assessment.get('progress', 0) >= 80:
-                            if st.button("📄 Report", key=f"report_{assessment_id}", use_container_width=True):
-                                st.session_state.current_waf_assessment_id = assessment_id
-                                st.session_state.show_report = True
-                                st.rerun()
-                    
-                    with col_d:
-                        if st.button("🗑️", key=f"delete_{assessment_id}", help="Delete assessment"):
-                            if st.session_state.get(f'confirm_delete_{assessment_id}', False):
-                                del st.session_state.waf_assessments[assessment_id]
-                                st.session_state.pop(f'confirm_delete_{assessment_id}', None)
-                                st.success("Deleted!")
-                                st.rerun()
-                            else:
-                                st.session_state[f'confirm_delete_{assessment_id}'] = True
-                                st.warning("Click again to confirm deletion")
-                    
-                    st.divider()
+                
+                with col_d:
+                    if st.button("🗑️ Delete", key="delete_selected", use_container_width=True):
+                        _confirm_delete(assessment_id)
     
     with col2:
         st.markdown("### ➕ Create New Assessment")
@@ -1192,21 +1634,24 @@ def render_assessments_list():
         with st.form("main_new_assessment_form"):
             st.caption("Create a comprehensive WAF assessment with AI assistance and automated scanning")
             
+            # Names are trimmed, so whitespace-only input counts as empty
             assessment_name = st.text_input(
                 "Assessment Name *",
-                placeholder="e.g., Production Workload Q4 2024"
-            )
+                placeholder="e.g., Production Workload Q4 2024",
+                key="new_assessment_name"
+            ).strip()
             
             workload_name = st.text_input(
                 "Workload Name *",
-                placeholder="e.g., E-commerce Platform"
-            )
+                placeholder="e.g., E-commerce Platform",
+                key="new_workload_name"
+            ).strip()
             
             col_type, col_env = st.columns(2)
             with col_type:
                 assessment_type = st.selectbox(
                     "Type",
-                    ["Quick (30 min)", "Standard (2 hours)", "Comprehensive (1 day)"]
+                    _ASSESSMENT_TYPES
                 )
             
             with col_env:
@@ -1251,7 +1696,8 @@ def render_assessments_list():
                     st.error("Please provide assessment and workload names")
                 else:
                     # Create new assessment
-                    assessment_id = str(uuid.uuid4())
+                    assessment_id = uuid.uuid4().hex
+                    now_iso = datetime.now().isoformat()
                     
                     new_assessment = {
                         'assessment_id': assessment_id,  # Added for Firebase compatibility
@@ -1261,8 +1707,8 @@ def render_assessments_list():
                         'type': assessment_type,
                         'environment': environment,
                         'aws_account': aws_account,
-                        'created_at': datetime.now().isoformat(),
-                        'updated_at': datetime.now().isoformat(),
+                        'created_at': now_iso,
+                        'updated_at': now_iso,
                         'progress': 0,
                         'overall_score': 0,
                         'responses': {},
@@ -1291,8 +1737,12 @@ def render_assessments_list():
                             else:
                                 st.success(f"✅ Created: {assessment_name} (Local only - Firebase: {message})")
                         else:
-                            st.success(f"✅ Created: {assessment_name} (Local only)")
-                            st.info("💡 Enable Firebase to persist assessments across sessions")
+                            from local_assessment_store import save_assessment_locally
+                            success, message = save_assessment_locally(assessment_id, new_assessment)
+                            if success:
+                                st.success(f"✅ Created: {assessment_name} (Saved locally)")
+                            else:
+                                st.warning(f"⚠️ Created: {assessment_name} (Session only - {message})")
                     except:
                         st.success(f"✅ Created: {assessment_name} (Local only)")
                     
@@ -1362,16 +1812,18 @@ def render_quick_scan():
         # Option to create full assessment from scan
         if st.button("📝 Create Full Assessment from This Scan", type="secondary"):
             # Create assessment with scan data pre-loaded
-            assessment_id = str(uuid.uuid4())
+            assessment_id = uuid.uuid4().hex
+            now = datetime.now()
+            now_iso = now.isoformat()
             new_assessment = {
                 'id': assessment_id,
-                'name': f"Assessment from Quick Scan {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+                'name': f"Assessment from Quick Scan {now.strftime('%Y-%m-%d %H:%M')}",
                 'workload_name': f"Account {aws_account or 'Unknown'}",
                 'type': "Standard (2 hours)",
                 'environment': "Production",
                 'aws_account': aws_account or '',
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat(),
+                'created_at': now_iso,
+                'updated_at': now_iso,
                 'progress': 0,
                 'responses': {},
                 'scores': {},
@@ -1385,6 +1837,11 @@ def render_quick_scan():
             
             st.session_state.waf_assessments[assessment_id] = new_assessment
             st.session_state.current_waf_assessment_id = assessment_id
+            if not st.session_state.get('firebase_initialized', False):
+                from local_assessment_store import save_assessment_locally
+                success, message = save_assessment_locally(assessment_id, new_assessment)
+                if not success:
+                    st.warning(f"⚠️ Assessment kept for this session only: {message}")
             st.success("✅ Assessment created with scan data!")
             st.rerun()
 
@@ -1392,7 +1849,8 @@ def run_standalone_scan(aws_account: str, region: str):
     """Run a standalone scan without assessment"""
     with st.spinner("🔍 Scanning AWS environment..."):
         try:
-            if AWS_INTEGRATION:
+            landscape_scanner = _get_landscape_scanner()
+            if landscape_scanner:
                 # Get AWS session from session state
                 session = st.session_state.get('aws_session')
                 
@@ -1402,7 +1860,7 @@ def run_standalone_scan(aws_account: str, region: str):
                     scan_results = generate_demo_scan_results()
                 else:
                     # Try real AWS scan with valid session
-                    scanner = AWSLandscapeScanner(session)
+                    scanner = landscape_scanner.AWSLandscapeScanner(session)
                     # Use provided region or default
                     regions = [region] if region else ['us-east-1']
                     
@@ -1502,7 +1960,7 @@ def render_analytics_dashboard():
             with col2:
                 st.metric("Score", f"{assessment.get('overall_score', 0):.0f}/100")
             with col3:
-                st.metric("Auto-detected", len(assessment.get('auto_detected', {})))
+                st.metric("Auto-detected", _collection_count(assessment, 'auto_detected'))
         
         return
     
@@ -1520,7 +1978,7 @@ def render_analytics_dashboard():
         avg_score = sum(a.get('overall_score', 0) for a in completed) / len(completed) if completed else 0
         st.metric("Average Score", f"{avg_score:.0f}/100")
     with col4:
-        avg_auto = sum(len(a.get('auto_detected', {})) for a in assessments.values()) / len(assessments)
+        avg_auto = sum(_collection_count(a, 'auto_detected') for a in assessments.values()) / len(assessments)
         st.metric("Avg Auto-detected", f"{avg_auto:.0f}")
     
     # Score trends
@@ -1534,12 +1992,10 @@ def render_analytics_dashboard():
     
     # Top action items
     st.markdown("### 🚨 Most Common Action Items")
-    all_action_items = []
-    for a in assessments.values():
-        all_action_items.extend(a.get('action_items', []))
+    total_action_items = sum(_collection_count(a, 'action_items') for a in assessments.values())
     
-    if all_action_items:
-        st.info(f"Total action items across all assessments: {len(all_action_items)}")
+    if total_action_items:
+        st.info(f"Total action items across all assessments: {total_action_items}")
     else:
         st.caption("No action items yet. Complete assessments to see recommendations.")
 
@@ -1649,6 +2105,10 @@ def render_compliance_view():
     
     # Use most recent completed assessment
     latest = max(completed, key=lambda x: x.get('updated_at', ''))
+    # Read from the local store without holding it in session state
+    latest = _load_full_assessment(latest)
+    if latest is None:
+        return
     
     # Compliance score calculation (simplified - based on WAF scores)
     responses = latest.get('responses', {})
@@ -1819,19 +2279,22 @@ def render_compliance_view():
         st.markdown("### ➕ New Assessment")
         
         with st.form("compliance_new_assessment_form"):
+            # Names are trimmed, so whitespace-only input counts as empty
             assessment_name = st.text_input(
                 "Assessment Name",
-                placeholder="e.g., Production Workload Q4 2024"
-            )
+                placeholder="e.g., Production Workload Q4 2024",
+                key="compliance_assessment_name"
+            ).strip()
             
             workload_name = st.text_input(
                 "Workload Name",
-                placeholder="e.g., E-commerce Platform"
-            )
+                placeholder="e.g., E-commerce Platform",
+                key="compliance_workload_name"
+            ).strip()
             
             assessment_type = st.selectbox(
                 "Assessment Type",
-                ["Quick (30 min)", "Standard (2 hours)", "Comprehensive (1 day)"]
+                _ASSESSMENT_TYPES
             )
             
             aws_account = st.text_input(
@@ -1863,7 +2326,8 @@ def render_compliance_view():
                     st.error("Please provide an assessment name")
                 else:
                     # Create new assessment
-                    assessment_id = str(uuid.uuid4())
+                    assessment_id = uuid.uuid4().hex
+                    now_iso = datetime.now().isoformat()
                     
                     new_assessment = {
                         'id': assessment_id,
@@ -1871,8 +2335,8 @@ def render_compliance_view():
                         'workload_name': workload_name,
                         'type': assessment_type,
                         'aws_account': aws_account,
-                        'created_at': datetime.now().isoformat(),
-                        'updated_at': datetime.now().isoformat(),
+                        'created_at': now_iso,
+                        'updated_at': now_iso,
                         'progress': 0,
                         'responses': {},
                         'scores': {},
@@ -1885,6 +2349,11 @@ def render_compliance_view():
                     
                     st.session_state.waf_assessments[assessment_id] = new_assessment
                     st.session_state.current_waf_assessment_id = assessment_id
+                    if not st.session_state.get('firebase_initialized', False):
+                        from local_assessment_store import save_assessment_locally
+                        success, message = save_assessment_locally(assessment_id, new_assessment)
+                        if not success:
+                            st.warning(f"⚠️ Assessment kept for this session only: {message}")
                     st.success(f"✅ Created: {assessment_name}")
                     
                     # If scanning enabled, trigger scan on next screen
@@ -1893,11 +2362,8 @@ def render_compliance_view():
                     
                     st.rerun()
 
-def render_assessment_workspace():
+def render_assessment_workspace(assessment: Optional[Dict]):
     """Render the assessment workspace with all its tabs"""
-    assessment_id = st.session_state.current_waf_assessment_id
-    assessment = st.session_state.waf_assessments.get(assessment_id)
-    
     if not assessment:
         st.error("Assessment not found")
         if st.button("← Back to Assessments"):
@@ -1923,6 +2389,12 @@ def render_assessment_workspace():
     
     with col3:
         if st.button("← Back to List", key="back_to_list", use_container_width=True):
+            # Locally stored assessments go back to a listing row once saved
+            if not st.session_state.get('firebase_initialized', False) and assessment.get('id'):
+                from local_assessment_store import save_assessment_locally, assessment_summary
+                success, _ = save_assessment_locally(assessment['id'], assessment)
+                if success:
+                    st.session_state.waf_assessments[assessment['id']] = assessment_summary(assessment['id'], assessment)
             st.session_state.current_waf_assessment_id = None
             st.session_state.show_report = False
             st.rerun()
@@ -1934,12 +2406,14 @@ def render_assessment_workspace():
         render_full_report(assessment)
         return
     
-    # Assessment workspace tabs
+    # Assessment workspace tabs. Each tab renderer is a fragment, so widgets
+    # inside one tab rerun only that tab, not its siblings
     tabs = st.tabs([
         "📊 Dashboard",
         "📝 Assessment",
         "🤖 AI Insights",
-        "📋 Action Items"
+        "📋 Action Items",
+        "📄 Reports"
     ])
     
     with tabs[0]:
@@ -1953,11 +2427,19 @@ def render_assessment_workspace():
     
     with tabs[3]:
         render_action_items_tab(assessment)
+    
+    with tabs[4]:
+        render_reports_tab(assessment)
 
 def render_full_report(assessment: Dict):
     """Render the complete assessment report"""
     st.markdown("### 📄 Assessment Report")
     
+    # Pillar scores come from the same aggregates as the dashboard; stored
+    # scores are only refreshed by a recalculation, so resync them before
+    # the report and its PDF read them
+    assessment['scores'] = _aggregate_pillar_scores(assessment)
+    
     # Header actions
     col1, col2, col3 = st.columns([2, 1, 1])
     with col1:
@@ -2010,7 +2492,7 @@ def render_full_report(assessment: Dict):
     with col_s1:
         st.metric("Overall Score", f"{assessment.get('overall_score', 0):.0f}/100")
     with col_s2:
-        total_q = 205
+        total_q = TOTAL_WAF_QUESTIONS
         answered = len(assessment.get('responses', {}))
         st.metric("Completion", f"{answered}/{total_q}")
     with col_s3:
@@ -2022,22 +2504,9 @@ def render_full_report(assessment: Dict):
     
     # Pillar Scores
     st.markdown("## Pillar Scores")
-    pillar_cols = st.columns(6)
-    for idx, pillar in enumerate(Pillar):
-        with pillar_cols[idx]:
-            score = assessment.get('scores', {}).get(pillar.value, 0)
-            st.markdown(f"""
-            <div style="text-align: center; padding: 1rem; background: white; 
-                        border-radius: 8px; border: 2px solid {pillar.color};">
-                <div style="font-size: 2rem;">{pillar.icon}</div>
-                <div style="font-size: 1.5rem; font-weight: bold; color: {pillar.color};">
-                    {score}
-                </div>
-                <div style="font-size: 0.8rem; color: #666;">
-                    {pillar.value.split()[0]}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+    scores = assessment['scores']
+    st.markdown(_pillar_cards_html(tuple(scores.get(v, 0) for v in _PILLAR_VALUES)),
+                unsafe_allow_html=True)
     
     # Key Findings
     st.markdown("## Key Findings")
@@ -2074,17 +2543,16 @@ def render_full_report(assessment: Dict):
     # Detailed responses by pillar
     st.markdown("## Detailed Responses")
     
-    # Get all questions to map responses to pillars
-    questions = get_complete_waf_questions()
-    question_map = {q.id: q for q in questions}
+    # Shared id -> question index for mapping responses to pillars
+    question_map = get_questions_by_id()
     
-    for pillar in Pillar:
+    for pillar in _PILLARS:
         with st.expander(f"{pillar.icon} {pillar.value}"):
             # FIX: Filter responses by matching question pillar, not by ID prefix
             pillar_responses = {}
             for qid, resp in responses.items():
                 question = question_map.get(qid)
-                if question and question.pillar == pillar:
+                if question and question.pillar is pillar:
                     pillar_responses[qid] = resp
             
             if pillar_responses:
@@ -2102,6 +2570,7 @@ def render_full_report(assessment: Dict):
             else:
                 st.caption("No responses yet for this pillar")
 
+@st.fragment
 def render_dashboard_tab(assessment: Dict):
     """Render assessment dashboard with scanning capability"""
     st.markdown("### 📊 Assessment Overview")
@@ -2136,6 +2605,7 @@ def render_dashboard_tab(assessment: Dict):
         st.divider()
     
     # Key metrics
+    responses = assessment.get('responses', {})
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
@@ -2143,12 +2613,12 @@ def render_dashboard_tab(assessment: Dict):
     with col2:
         st.metric("Progress", f"{assessment.get('progress', 0)}%")
     with col3:
-        st.metric("Questions", f"{len(assessment.get('responses', {}))}/205")
+        st.metric("Questions", f"{len(responses)}/{TOTAL_WAF_QUESTIONS}")
     with col4:
         st.metric("Action Items", len(assessment.get('action_items', [])))
     
     # ADD RECALCULATE BUTTON - CRITICAL FIX FOR EXISTING ASSESSMENTS
-    if len(assessment.get('responses', {})) > 0:
+    if responses:
         if assessment.get('overall_score', 0) == 0 or assessment.get('progress', 0) != 100:
             st.warning("⚠️ Scores need recalculation. Click the button below to fix.")
         
@@ -2168,6 +2638,11 @@ def render_dashboard_tab(assessment: Dict):
                         if st.session_state.get('firebase_initialized', False):
                             assessment_id = assessment.get('assessment_id') or assessment.get('id')
                             save_assessment_to_firebase(assessment_id, assessment)
+                        else:
+                            from local_assessment_store import save_assessment_locally
+                            success, message = save_assessment_locally(assessment.get('id'), assessment)
+                            if not success:
+                                st.warning(f"⚠️ Recalculated scores kept for this session only: {message}")
                     except:
                         pass
                     
@@ -2188,23 +2663,32 @@ def render_dashboard_tab(assessment: Dict):
     # Pillar scores
     st.markdown("### 🎯 Pillar Scores")
     
-    pillar_cols = st.columns(6)
-    for idx, pillar in enumerate(Pillar):
-        with pillar_cols[idx]:
-            score = assessment.get('scores', {}).get(pillar.value, 0)
-            st.markdown(f"""
-            <div style="text-align: center; padding: 1rem; background: white; 
-                        border-radius: 8px; border: 2px solid {pillar.color};">
-                <div style="font-size: 2rem;">{pillar.icon}</div>
-                <div style="font-size: 1.5rem; font-weight: bold; color: {pillar.color};">
-                    {score}
-                </div>
-                <div style="font-size: 0.8rem; color: #666;">
-                    {pillar.value.split()[0]}
-                </div>
+    scores = _aggregate_pillar_scores(assessment)
+    st.markdown(_pillar_cards_html(tuple(scores.get(v, 0) for v in _PILLAR_VALUES)),
+                unsafe_allow_html=True)
+
+@lru_cache(maxsize=128)
+def _pillar_cards_html(scores: Tuple[float, ...]) -> str:
+    """
+    Build all six pillar score cards as one flex row (a single markdown element).
+    
+    scores is one value per pillar in Pillar order; scores rarely change
+    between reruns, so the HTML is cached on that tuple.
+    """
+    cards = "".join(f"""
+        <div style="flex: 1; text-align: center; padding: 1rem; background: white; 
+                    border-radius: 8px; border: 2px solid {pillar.color};">
+            <div style="font-size: 2rem;">{pillar.icon}</div>
+            <div style="font-size: 1.5rem; font-weight: bold; color: {pillar.color};">
+                {score}
             </div>
-            """, unsafe_allow_html=True)
+            <div style="font-size: 0.8rem; color: #666;">
+                {pillar.value.split()[0]}
+            </div>
+        </div>""" for pillar, score in zip(_PILLARS, scores))
+    return f'<div style="display: flex; gap: 1rem;">{cards}\n</div>'
 
+@st.fragment
 def render_assessment_tab(assessment: Dict):
     """Render assessment questions with AI assistance and PAGINATION - ENHANCED VERSION"""
     
@@ -2225,7 +2709,7 @@ def render_assessment_tab(assessment: Dict):
     with col1:
         pillar_filter = st.selectbox(
             "Select Pillar",
-            ["All"] + [p.value for p in Pillar],
+            _PILLAR_FILTER_OPTIONS,
             key="pillar_filter"
         )
     with col2:
@@ -2246,9 +2730,7 @@ def render_assessment_tab(assessment: Dict):
         """)
     
     # Filter questions by pillar
-    filtered_questions = questions
-    if pillar_filter != "All":
-        filtered_questions = [q for q in questions if q.pillar.value == pillar_filter]
+    filtered_questions = _questions_index()[pillar_filter]
     
     # Get auto-detected questions
     auto_detected = assessment.get('auto_detected', {})
@@ -2265,207 +2747,339 @@ def render_assessment_tab(assessment: Dict):
     # USE PAGINATION MODULE (if available) - NEW!
     # ============================================================================
     if PAGINATION_AVAILABLE:
-        # CRITICAL FIX: Pass ALL questions (not filtered_questions) for accurate scoring
-        # The pagination module will handle pillar filtering for display
-        render_questions_with_pagination(assessment, questions, pillar_filter)
+        # CRITICAL FIX: Pass ALL questions (not filtered_questions) for accurate scoring;
+        # the pillar's display list comes from the prebuilt index
+        render_questions_with_pagination(assessment, questions, pillar_filter,
+                                         filtered_questions=filtered_questions)
     else:
         # Fallback to original loop-based rendering (show limited questions)
         st.warning("Using legacy view. Install pagination module for better experience.")
-        show_count = st.number_input("Show", min_value=5, max_value=50, value=10, step=5)
+        # Only the current page's questions are rendered (and run their widgets)
+        page_size = 5
+        page_count = max(1, (len(filtered_questions) + page_size - 1) // page_size)
+        # Pages are remembered per pillar, so switching pillars keeps your place
+        legacy_pages = st.session_state.setdefault('legacy_page_by_pillar', {})
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count,
+                               value=min(legacy_pages.get(pillar_filter, 1), page_count), step=1,
+                               key=f"legacy_page_{pillar_filter}")
+        legacy_pages[pillar_filter] = page
         
         # Original loop rendering (kept as fallback)
-        for idx, question in enumerate(filtered_questions[:show_count]):
-            is_auto_detected = question.id in auto_detected
-            detected_data = auto_detected.get(question.id, {})
-            
-            expander_title = f"{question.pillar.icon} {question.id}: {question.text}"
-            if is_auto_detected:
-                expander_title = f"✅ {expander_title}"
+        for question in filtered_questions[(page - 1) * page_size:page * page_size]:
+            _render_question(question, assessment)
+
+@st.fragment
+def _render_question(question: Question, assessment: Dict):
+    """
+    Render one question of the legacy (non-paginated) view.
+    
+    Runs as a fragment: answering, AI help and saving only rerun this
+    question instead of the whole hub.
+    """
+    auto_detected = assessment.get('auto_detected', {})
+    responses = assessment.setdefault('responses', {})
+    is_auto_detected = question.id in auto_detected
+    detected_data = auto_detected.get(question.id, {})
+
+    expander_title = question.title_label
+    if is_auto_detected:
+        expander_title = f"✅ {expander_title}"
+
+    with st.expander(expander_title):
+        st.markdown(
+            f"<div><p><b>Category:</b> {html.escape(question.category)}</p>"
+            f"<p>{question.description_html}</p></div>",
+            unsafe_allow_html=True
+        )
+
+        # AUTO-DETECTION SECTION
+        if is_auto_detected:
+            st.markdown("---")
+            st.markdown("### 🔍 Auto-Detected from AWS Scan")
+
+            confidence = detected_data.get('confidence', 0)
+            confidence_color = "🟢" if confidence >= 85 else "🟡" if confidence >= 70 else "🟠"
+
+            col_det1, col_det2 = st.columns([3, 1])
+            with col_det1:
+                st.success(f"""
+                **{confidence_color} Auto-Detected Answer**
+                - Confidence: {confidence}%
+                - Detected: {question.choices[detected_data.get('choice_index', 0)].text[:80]}...
+                - Evidence: {len(detected_data.get('evidence', []))} findings
+                """)
+
+            with col_det2:
+                override = st.checkbox("✏️ Override", key=f"override_{question.id}")
+
+            if detected_data.get('evidence'):
+                with st.expander("📊 View Scan Evidence"):
+                    for ev in detected_data.get('evidence', []):
+                        st.caption(f"• {ev}")
+
+            st.markdown("---")
+        else:
+            override = False
+
+        # AI Assistant Button
+        col_ai, col_scan_info = st.columns([1, 3])
+        with col_ai:
+            deep = st.toggle("Deep analysis", value=False, key=f"ai_deep_{question.id}",
+                             help="Use the larger, slower model for a more thorough answer")
+            if st.button(f"🤖 Get AI Help", key=f"ai_help_{question.id}", use_container_width=True, type="secondary"):
+                with st.spinner("🤖 AI is analyzing this question for you..."):
+                    ai_assistance = get_ai_question_assistance(question, assessment, deep=deep)
+                    if ai_assistance:
+                        st.session_state[f"ai_assist_{question.id}"] = ai_assistance
+                        st.success("✅ AI analysis complete!")
+
+        with col_scan_info:
+            if is_auto_detected and not override:
+                st.info("💡 Using auto-detected answer. Check 'Override' to manually select.")
+            elif not is_auto_detected:
+                st.caption("⚠️ Manual answer required (not auto-detectable)")
+
+        # Show AI assistance if available
+        if f"ai_assist_{question.id}" in st.session_state:
+            ai_help = st.session_state[f"ai_assist_{question.id}"]
+            st.markdown("---")
+
+            st.markdown("### 🤖 AI Assistant Analysis")
+            st.caption("*Personalized guidance powered by Claude AI*")
+
+            ai_tabs = st.tabs(["📖 Explanation", "💡 Why It Matters", "✅ Recommendation", "📚 Example", "🛠️ Steps"])
+
+            with ai_tabs[0]:
+                st.markdown("**Simplified Explanation:**")
+                st.info(ai_help.get('simplified_explanation', 'Processing...'))
+
+            with ai_tabs[1]:
+                st.markdown("**Business Impact:**")
+                st.success(ai_help.get('why_matters', 'Processing...'))
+
+            with ai_tabs[2]:
+                st.markdown("**AI Recommendation:**")
+                st.warning(ai_help.get('recommendation', 'Processing...'))
+
+            with ai_tabs[3]:
+                st.markdown("**Real-World Example:**")
+                st.markdown(ai_help.get('example', 'Processing...'))
+
+            with ai_tabs[4]:
+                st.markdown("**Implementation Steps:**")
+                st.markdown(ai_help.get('implementation_steps', 'Processing...'))
+
+            st.markdown("---")
+
+        st.markdown("**Select your answer:**")
+
+        # Response selection
+        response_key = f"response_{question.id}"
+        current_response = responses.get(question.id)
+
+        # Determine default index
+        if is_auto_detected and not override:
+            default_index = detected_data.get('choice_index', 0)
+        elif current_response:
+            default_index = current_response.get('choice_index', 0)
+        else:
+            default_index = 0
+
+        # Answer and notes are batched in a form so typing/selecting doesn't rerun
+        with st.form(f"q_form_{question.id}", clear_on_submit=False):
+            selected_choice = st.radio(
+                "Choose one:",
+                range(len(question.choices)),
+                format_func=lambda i: question.choices[i].choice_label,
+                key=response_key,
+                index=default_index,
+                disabled=(is_auto_detected and not override)
+            )
+
+            # Show guidance for selected choice (refreshes on submit)
+            if selected_choice is not None:
+                st.caption(f"💬 **Guidance:** {question.choices[selected_choice].guidance}")
+
+            # Notes
+            notes_default = ""
+            if is_auto_detected and not override:
+                notes_default = "Auto-detected from AWS scan\n" + "\n".join([f"• {e}" for e in detected_data.get('evidence', [])])
+            elif current_response:
+                notes_default = current_response.get('notes', '')
+
+            notes = st.text_area(
+                "Additional Notes & Evidence",
+                value=notes_default,
+                key=f"notes_{question.id}",
+                placeholder="Add context, evidence, or observations that support your answer...",
+                height=100
+            )
+
+            # SAVE BUTTON - Now with Firebase integration
+            submitted = st.form_submit_button("💾 Save Response", use_container_width=True, type="primary")
+
+        if submitted:
+            # Import Firebase helper
+            try:
+                from firebase_database_helper import save_assessment_to_firebase, auto_sync_response
+                FIREBASE_AVAILABLE = st.session_state.get('firebase_initialized', False)
+            except:
+                FIREBASE_AVAILABLE = False
+
+            now_iso = datetime.now().isoformat()
             
-            with st.expander(expander_title):
-                st.markdown(f"**Category:** {question.category}")
-                st.markdown(question.description)
-                
-                # AUTO-DETECTION SECTION
-                if is_auto_detected:
-                    st.markdown("---")
-                    st.markdown("### 🔍 Auto-Detected from AWS Scan")
-                    
-                    confidence = detected_data.get('confidence', 0)
-                    confidence_color = "🟢" if confidence >= 85 else "🟡" if confidence >= 70 else "🟠"
-                    
-                    col_det1, col_det2 = st.columns([3, 1])
-                    with col_det1:
-                        st.success(f"""
-                        **{confidence_color} Auto-Detected Answer**
-                        - Confidence: {confidence}%
-                        - Detected: {question.choices[detected_data.get('choice_index', 0)].text[:80]}...
-                        - Evidence: {len(detected_data.get('evidence', []))} findings
-                        """)
-                    
-                    with col_det2:
-                        override = st.checkbox("✏️ Override", key=f"override_{question.id}")
-                    
-                    if detected_data.get('evidence'):
-                        with st.expander("📊 View Scan Evidence"):
-                            for ev in detected_data.get('evidence', []):
-                                st.caption(f"• {ev}")
-                    
-                    st.markdown("---")
+            # Prepare response data
+            response_data = {
+                'choice_index': selected_choice,
+                'choice_text': question.choices[selected_choice].text,
+                'risk_level': question.choices[selected_choice].risk_level.label,
+                'points': question.choices[selected_choice].points,
+                'notes': notes,
+                'timestamp': now_iso,
+                'ai_assisted': f"ai_assist_{question.id}" in st.session_state,
+                'auto_detected': is_auto_detected,
+                'overridden': (is_auto_detected and override),
+                'scan_confidence': detected_data.get('confidence', 0) if is_auto_detected else 0
+            }
+
+            # Save to session state
+            previous_response = responses.get(question.id)
+            responses[question.id] = response_data
+            record_response_aggregate(assessment, question.id, previous_response, response_data)
+
+            # Update progress
+            assessment['progress'] = int((len(responses) / TOTAL_WAF_QUESTIONS) * 100)
+            assessment['updated_at'] = now_iso
+
+            # Track AI assistance usage
+            if f"ai_assist_{question.id}" in st.session_state:
+                if 'ai_assistance_used' not in assessment:
+                    assessment['ai_assistance_used'] = 0
+                assessment['ai_assistance_used'] += 1
+                del st.session_state[f"ai_assist_{question.id}"]
+
+            # NEW: Save to Firebase if available
+            if FIREBASE_AVAILABLE:
+                assessment_id = assessment.get('assessment_id', 'default')
+                sync_success = auto_sync_response(assessment_id, question.id, response_data)
+
+                if not sync_success:
+                    success, message = save_assessment_to_firebase(assessment_id, assessment)
+                    if success:
+                        st.success("✅ Response saved to Firebase!")
+                    else:
+                        st.warning(f"⚠️ Saved locally but Firebase sync failed: {message}")
                 else:
-                    override = False
-                
-                # AI Assistant Button
-                col_ai, col_scan_info = st.columns([1, 3])
-                with col_ai:
-                    if st.button(f"🤖 Get AI Help", key=f"ai_help_{question.id}", use_container_width=True, type="secondary"):
-                        with st.spinner("🤖 AI is analyzing this question for you..."):
-                            ai_assistance = get_ai_question_assistance(question, assessment)
-                            if ai_assistance:
-                                st.session_state[f"ai_assist_{question.id}"] = ai_assistance
-                                st.success("✅ AI analysis complete!")
-                
-                with col_scan_info:
-                    if is_auto_detected and not override:
-                        st.info("💡 Using auto-detected answer. Check 'Override' to manually select.")
-                    elif not is_auto_detected:
-                        st.caption("⚠️ Manual answer required (not auto-detectable)")
-                
-                # Show AI assistance if available
-                if f"ai_assist_{question.id}" in st.session_state:
-                    ai_help = st.session_state[f"ai_assist_{question.id}"]
-                    st.markdown("---")
-                    
-                    st.markdown("### 🤖 AI Assistant Analysis")
-                    st.caption("*Personalized guidance powered by Claude AI*")
-                    
-                    ai_tabs = st.tabs(["📖 Explanation", "💡 Why It Matters", "✅ Recommendation", "📚 Example", "🛠️ Steps"])
-                    
-                    with ai_tabs[0]:
-                        st.markdown("**Simplified Explanation:**")
-                        st.info(ai_help.get('simplified_explanation', 'Processing...'))
-                    
-                    with ai_tabs[1]:
-                        st.markdown("**Business Impact:**")
-                        st.success(ai_help.get('why_matters', 'Processing...'))
-                    
-                    with ai_tabs[2]:
-                        st.markdown("**AI Recommendation:**")
-                        st.warning(ai_help.get('recommendation', 'Processing...'))
-                    
-                    with ai_tabs[3]:
-                        st.markdown("**Real-World Example:**")
-                        st.markdown(ai_help.get('example', 'Processing...'))
-                    
-                    with ai_tabs[4]:
-                        st.markdown("**Implementation Steps:**")
-                        st.markdown(ai_help.get('implementation_steps', 'Processing...'))
-                    
-                    st.markdown("---")
-                
-                st.markdown("**Select your answer:**")
-                
-                # Response selection
-                response_key = f"response_{question.id}"
-                current_response = assessment.get('responses', {}).get(question.id, {})
-                
-                # Determine default index
-                if is_auto_detected and not override:
-                    default_index = detected_data.get('choice_index', 0)
-                elif current_response:
-                    default_index = current_response.get('choice_index', 0)
+                    st.success("✅ Response saved successfully!")
+            else:
+                from local_assessment_store import save_assessment_locally
+                success, message = save_assessment_locally(assessment.get('id'), assessment)
+                if success:
+                    st.success("✅ Response saved locally!")
                 else:
-                    default_index = 0
-                
-                selected_choice = st.radio(
-                    "Choose one:",
-                    range(len(question.choices)),
-                    format_func=lambda i: f"{question.choices[i].risk_level.icon} {question.choices[i].text}",
-                    key=response_key,
-                    index=default_index,
-                    disabled=(is_auto_detected and not override)
-                )
-                
-                # Show guidance for selected choice
-                if selected_choice is not None:
-                    st.caption(f"💬 **Guidance:** {question.choices[selected_choice].guidance}")
-                
-                # Notes
-                notes_default = ""
-                if is_auto_detected and not override:
-                    notes_default = "Auto-detected from AWS scan\n" + "\n".join([f"• {e}" for e in detected_data.get('evidence', [])])
-                elif current_response:
-                    notes_default = current_response.get('notes', '')
-                
-                notes = st.text_area(
-                    "Additional Notes & Evidence",
-                    value=notes_default,
-                    key=f"notes_{question.id}",
-                    placeholder="Add context, evidence, or observations that support your answer...",
-                    height=100
-                )
-                
-                # SAVE BUTTON - Now with Firebase integration
-                if st.button("💾 Save Response", key=f"save_{question.id}", use_container_width=True, type="primary"):
-                    # Import Firebase helper
-                    try:
-                        from firebase_database_helper import save_assessment_to_firebase, auto_sync_response
-                        FIREBASE_AVAILABLE = st.session_state.get('firebase_initialized', False)
-                    except:
-                        FIREBASE_AVAILABLE = False
-                    
-                    # Prepare response data
-                    response_data = {
-                        'choice_index': selected_choice,
-                        'choice_text': question.choices[selected_choice].text,
-                        'risk_level': question.choices[selected_choice].risk_level.label,
-                        'points': question.choices[selected_choice].points,
-                        'notes': notes,
-                        'timestamp': datetime.now().isoformat(),
-                        'ai_assisted': f"ai_assist_{question.id}" in st.session_state,
-                        'auto_detected': is_auto_detected,
-                        'overridden': (is_auto_detected and override),
-                        'scan_confidence': detected_data.get('confidence', 0) if is_auto_detected else 0
-                    }
-                    
-                    # Save to session state
-                    if 'responses' not in assessment:
-                        assessment['responses'] = {}
-                    assessment['responses'][question.id] = response_data
-                    
-                    # Update progress
-                    total_questions = len(questions)
-                    assessment['progress'] = int((len(assessment['responses']) / total_questions) * 100)
-                    assessment['updated_at'] = datetime.now().isoformat()
-                    
-                    # Track AI assistance usage
-                    if f"ai_assist_{question.id}" in st.session_state:
-                        if 'ai_assistance_used' not in assessment:
-                            assessment['ai_assistance_used'] = 0
-                        assessment['ai_assistance_used'] += 1
-                        del st.session_state[f"ai_assist_{question.id}"]
-                    
-                    # NEW: Save to Firebase if available
-                    if FIREBASE_AVAILABLE:
-                        assessment_id = assessment.get('assessment_id', 'default')
-                        sync_success = auto_sync_response(assessment_id, question.id, response_data)
-                        
-                        if not sync_success:
-                            success, message = save_assessment_to_firebase(assessment_id, assessment)
-                            if success:
-                                st.success("✅ Response saved to Firebase!")
-                            else:
-                                st.warning(f"⚠️ Saved locally but Firebase sync failed: {message}")
-                        else:
-                            st.success("✅ Response saved successfully!")
-                    else:
-                        st.success("✅ Response saved locally!")
-                        if not st.session_state.get('firebase_initialized', False):
-                            st.info("💡 Enable Firebase to persist data across sessions")
-                    
-                    st.rerun()
+                    st.warning(f"⚠️ Response kept for this session only: {message}")
+
+            st.rerun(scope="fragment")
+
+# Models for AI question assistance: fast by default, larger on request.
+# The five-field guidance fits comfortably in 900 output tokens.
+_AI_FAST_MODEL = "claude-haiku-4-5-20251001"
+_AI_DEEP_MODEL = "claude-sonnet-4-20250514"
+
+# Structured-output schema for AI question assistance: Claude is forced to call
+# this tool, so its input arrives as a dict with exactly these keys
+_WAF_GUIDANCE_TOOL = {
+    "name": "waf_guidance",
+    "description": "Return guidance for answering one Well-Architected question",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "simplified_explanation": {"type": "string"},
+            "why_matters": {"type": "string"},
+            "recommendation": {"type": "string"},
+            "example": {"type": "string"},
+            "implementation_steps": {"type": "string"}
+        },
+        "required": [
+            "simplified_explanation", "why_matters", "recommendation",
+            "example", "implementation_steps"
+        ]
+    }
+}
+
+def _build_prompt(question: Question, assessment: Dict) -> str:
+    """Build the AI-assistance prompt for a question in the context of an assessment"""
+    # Build context-aware prompt
+    workload_context = f"""
+Workload Name: {assessment.get('workload_name', 'Not specified')}
+Assessment Type: {assessment.get('type', 'Not specified')}
+Organization: {assessment.get('name', 'Not specified')}
+AWS Account: {assessment.get('aws_account', 'Not specified')}
+"""
+
+    return f"""You are an expert AWS Solutions Architect helping users complete a Well-Architected Framework assessment.
+
+QUESTION DETAILS:
+- ID: {question.id}
+- Pillar: {question.pillar.value}
+- Category: {question.category}
+- Question: {question.text}
+- Description: {question.description}
+
+WORKLOAD CONTEXT:
+{workload_context}
+
+BEST PRACTICES:
+{chr(10).join(f"- {bp}" for bp in question.best_practices)}
 
-def get_ai_question_assistance(question: Question, assessment: Dict) -> Optional[Dict]:
+ANSWER CHOICES:
+{chr(10).join(f"{i+1}. {choice.text} ({choice.risk_level.label} risk, {choice.points} points)" for i, choice in enumerate(question.choices))}
+
+Respond by calling the waf_guidance tool with these fields:
+
+{{
+  "simplified_explanation": "2-3 sentences explaining this question in simple, non-technical language that a business user can understand",
+  "why_matters": "2-3 sentences explaining the real business impact - why should they care about this? What happens if they get it wrong?",
+  "recommendation": "3-4 sentences recommending which answer choice is likely best for their workload and explaining why, based on the context provided",
+  "example": "A concrete 4-5 sentence real-world example (anonymized) showing how a company addressed this area successfully or failed to address it",
+  "implementation_steps": "4-6 bullet points (using • prefix) with practical, actionable steps they can take to improve in this area"
+}}
+
+Be conversational, practical, and avoid jargon. Focus on actionable advice."""
+
+@st.cache_resource(show_spinner=False)
+def _get_anthropic_client(api_key_hash: str, _api_key: str):
+    """One Anthropic client per API key, so calls reuse its HTTP connection pool"""
+    return _get_anthropic().Anthropic(api_key=_api_key)
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _call_claude(prompt: str, model: str, api_key_hash: str, _api_key: str) -> Dict:
+    """
+    Ask Claude for question assistance, memoized across sessions for a day.
+    
+    Keyed by the prompt, model and a short hash of the API key; the raw key is
+    underscore-prefixed so Streamlit never hashes or stores it. Raises
+    ValueError when the reply contains no guidance tool call: cache_data
+    never stores exceptions, so only real guidance is memoized.
+    """
+    client = _get_anthropic_client(api_key_hash, _api_key)
+    
+    response = client.messages.create(
+        model=model,
+        max_tokens=900,
+        temperature=0.3,
+        tools=[_WAF_GUIDANCE_TOOL],
+        tool_choice={"type": "tool", "name": _WAF_GUIDANCE_TOOL["name"]},
+        messages=[{"role": "user", "content": prompt}]
+    )
+    
+    # The forced tool call carries the already-parsed guidance dict
+    for block in response.content:
+        if block.type == "tool_use":
+            return block.input
+    raise ValueError("Claude reply contained no guidance tool call")
+
+def get_ai_question_assistance(question: Question, assessment: Dict, deep: bool = False) -> Optional[Dict]:
     """
     Get AI-powered assistance for understanding and answering questions.
     
@@ -2477,8 +3091,12 @@ def get_ai_question_assistance(question: Question, assessment: Dict) -> Optional
     - Tailored to the user's specific workload
     
     AWS's tool just shows questions - we provide intelligent guidance!
+    
+    First-pass guidance uses the fast model; deep=True switches to the
+    larger model for an opt-in, more thorough answer.
     """
-    if not ANTHROPIC_AVAILABLE:
+    anthropic = _get_anthropic()
+    if anthropic is None:
         return {
             'simplified_explanation': "AI assistance requires the Anthropic library. Install with: pip install anthropic",
             'why_matters': "This question is part of AWS best practices for well-architected workloads.",
@@ -2510,66 +3128,15 @@ def get_ai_question_assistance(question: Question, assessment: Dict) -> Optional
                 'implementation_steps': "• Add ANTHROPIC_API_KEY to .streamlit/secrets.toml\n• Restart the application\n• Click AI Help again"
             }
         
-        client = anthropic.Anthropic(api_key=api_key)
+        import hashlib
         
-        # Build context-aware prompt
-        workload_context = f"""
-Workload Name: {assessment.get('workload_name', 'Not specified')}
-Assessment Type: {assessment.get('type', 'Not specified')}
-Organization: {assessment.get('name', 'Not specified')}
-AWS Account: {assessment.get('aws_account', 'Not specified')}
-"""
-        
-        prompt = f"""You are an expert AWS Solutions Architect helping users complete a Well-Architected Framework assessment.
-
-QUESTION DETAILS:
-- ID: {question.id}
-- Pillar: {question.pillar.value}
-- Category: {question.category}
-- Question: {question.text}
-- Description: {question.description}
-
-WORKLOAD CONTEXT:
-{workload_context}
-
-BEST PRACTICES:
-{chr(10).join(f"- {bp}" for bp in question.best_practices)}
-
-ANSWER CHOICES:
-{chr(10).join(f"{i+1}. {choice.text} ({choice.risk_level.label} risk, {choice.points} points)" for i, choice in enumerate(question.choices))}
-
-Provide a JSON response with these exact keys:
-
-{{
-  "simplified_explanation": "2-3 sentences explaining this question in simple, non-technical language that a business user can understand",
-  "why_matters": "2-3 sentences explaining the real business impact - why should they care about this? What happens if they get it wrong?",
-  "recommendation": "3-4 sentences recommending which answer choice is likely best for their workload and explaining why, based on the context provided",
-  "example": "A concrete 4-5 sentence real-world example (anonymized) showing how a company addressed this area successfully or failed to address it",
-  "implementation_steps": "4-6 bullet points (using • prefix) with practical, actionable steps they can take to improve in this area"
-}}
-
-Be conversational, practical, and avoid jargon. Focus on actionable advice."""
-
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            temperature=0.7,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        # Parse response
-        import json
-        import re
-        
-        text = response.content[0].text
-        
-        # Try to extract JSON
-        json_match = re.search(r'\{[\s\S]*\}', text)
-        if json_match:
-            result = json.loads(json_match.group())
-            return result
-        else:
-            # Fallback
+        prompt = _build_prompt(question, assessment)
+        api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()[:8]
+        model = _AI_DEEP_MODEL if deep else _AI_FAST_MODEL
+        try:
+            return _call_claude(prompt, model, api_key_hash, api_key)
+        except ValueError:
+            # Fallback (not cached, so the next click asks Claude again)
             return {
                 'simplified_explanation': "This question assesses a critical aspect of your AWS architecture.",
                 'why_matters': "Following best practices in this area reduces risk and improves reliability.",
@@ -2587,11 +3154,23 @@ Be conversational, practical, and avoid jargon. Focus on actionable advice."""
             'implementation_steps': "• Review documentation\n• Assess current state\n• Plan improvements"
         }
 
+def _responses_fingerprint(responses: Dict) -> str:
+    """Short content hash of the answers and notes that AI insights are built from"""
+    import hashlib
+    
+    payload = json.dumps(
+        [(qid, r.get('choice_index'), r.get('notes', '')) for qid, r in sorted(responses.items())],
+        separators=(',', ':')
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+@st.fragment
 def render_ai_insights_tab(assessment: Dict):
     """Render AI-powered insights with comprehensive pillar-wise analysis"""
     st.markdown("### 🤖 AI-Powered Insights & Recommendations")
     
-    if not ANTHROPIC_AVAILABLE:
+    # Only check the SDK is installed; it is imported when insights are generated
+    if not _module_available("anthropic"):
         st.warning("⚠️ Anthropic API not available. Install with: `pip install anthropic`")
         st.info("💡 Add your ANTHROPIC_API_KEY to Streamlit secrets to enable AI insights.")
         return
@@ -2617,8 +3196,12 @@ def render_ai_insights_tab(assessment: Dict):
     Claude AI will provide comprehensive insights based on your responses.
     """)
     
-    # Check if insights are already cached in session state
+    # Insights held in session state: one (fingerprint, insights) entry per
+    # assessment, current only while the responses still match the fingerprint
     cache_key = f"ai_insights_{assessment.get('id', 'unknown')}"
+    fingerprint = _responses_fingerprint(responses)
+    cached = st.session_state.get(cache_key)
+    insights = cached[1] if cached is not None and cached[0] == fingerprint else None
     
     col1, col2 = st.columns([3, 1])
     
@@ -2630,16 +3213,19 @@ def render_ai_insights_tab(assessment: Dict):
         )
     
     with col2:
-        if cache_key in st.session_state:
+        if insights is not None:
             if st.button("🔄 Regenerate", use_container_width=True):
-                # Clear cache to regenerate
-                del st.session_state[cache_key]
-                st.rerun()
+                # Drop the session copy and move to a new generation, so the
+                # cross-session cache is bypassed rather than replayed
+                insights = None
+                generations = st.session_state.setdefault('ai_insights_generation', {})
+                generations[assessment.get('id')] = generations.get(assessment.get('id'), 0) + 1
+                generate_button = True
     
     # Generate or show cached insights
-    if generate_button or cache_key in st.session_state:
+    if generate_button or insights is not None:
         
-        if cache_key not in st.session_state:
+        if insights is None:
             # Generate new insights
             with st.spinner("🤖 Claude is analyzing your assessment... This may take 30-60 seconds."):
                 try:
@@ -2650,10 +3236,13 @@ def render_ai_insights_tab(assessment: Dict):
                     questions = get_complete_waf_questions()
                     
                     # Generate insights
-                    insights = generate_comprehensive_insights(assessment, questions)
+                    insights = generate_comprehensive_insights(
+                        assessment, questions,
+                        generation=st.session_state.get('ai_insights_generation', {}).get(assessment.get('id'), 0)
+                    )
                     
-                    # Cache the results
-                    st.session_state[cache_key] = insights
+                    # Cache the results, replacing any entry for older responses
+                    st.session_state[cache_key] = (fingerprint, insights)
                     
                     st.success("✅ AI analysis complete!")
                     
@@ -2665,7 +3254,6 @@ def render_ai_insights_tab(assessment: Dict):
         # Display insights
         try:
             from ai_insights_generator import format_insights_for_display
-            insights = st.session_state[cache_key]
             
             st.divider()
             format_insights_for_display(insights)
@@ -2674,6 +3262,64 @@ def render_ai_insights_tab(assessment: Dict):
             st.error(f"❌ Failed to display insights: {str(e)}")
             st.exception(e)
 
+_ACTION_ITEM_GROUPS = (("CRITICAL", "🔴 Critical"), ("HIGH", "🟠 High"), ("MEDIUM", "🟡 Medium"))
+
+# Sort rank for priority labels; numeric priorities (1 = most urgent) rank as-is
+_PRIORITY_RANK = {"CRITICAL": 1, "HIGH": 2, "MEDIUM": 3, "LOW": 4}
+
+def _priority_rank(item: Dict) -> int:
+    """Sort key for an action item's priority, unknown priorities last"""
+    priority = item.get('priority')
+    if isinstance(priority, int):
+        return priority
+    return _PRIORITY_RANK.get(str(priority).upper(), len(_PRIORITY_RANK) + 1)
+
+def _action_items_fingerprint(action_items: List[Dict]) -> str:
+    """Short content hash of the action items, so edits in place are seen too"""
+    import hashlib
+    
+    payload = json.dumps(action_items, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+def _action_items_view(assessment: Dict, action_items: List[Dict]) -> Tuple[Dict[str, int], List[Dict]]:
+    """
+    Risk counts and table rows for the action items tab.
+    
+    Rows are grouped by risk level and sorted by priority within each group.
+    Cached in session state per assessment and reused while the items'
+    content is unchanged.
+    """
+    key = _action_items_fingerprint(action_items)
+    views = st.session_state.setdefault('_action_item_views', {})
+    cached = views.get(assessment.get('id'))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    # Group by risk level in one pass; each group is sorted by priority below
+    groups = {level: [] for level, _ in _ACTION_ITEM_GROUPS}
+    for item in action_items:
+        group = groups.get(str(item.get('risk_level', '')).upper())
+        if group is not None:
+            group.append(item)
+    
+    rows = [
+        {
+            'Risk': label,
+            'Pillar': item.get('pillar', 'Unknown'),
+            'Action Item': item.get('title', 'Action Item'),
+            'Description': item.get('description', 'No description available'),
+            'Priority': str(item.get('priority', 'Unknown')),
+            'Effort': item.get('effort', 'Unknown'),
+            'Cost': item.get('cost', 'Unknown')
+        }
+        for level, label in _ACTION_ITEM_GROUPS
+        for item in sorted(groups[level], key=_priority_rank)
+    ]
+    view = ({level: len(items) for level, items in groups.items()}, rows)
+    views[assessment.get('id')] = (key, view)
+    return view
+
+@st.fragment
 def render_action_items_tab(assessment: Dict):
     """Render action items"""
     st.markdown("### 📋 Action Items")
@@ -2708,59 +3354,58 @@ def render_action_items_tab(assessment: Dict):
             st.info(f"✅ No action items yet. Complete the assessment ({progress:.0f}% done) to generate recommendations.")
         return
     
-    # Display action items grouped by priority
-    critical_items = [item for item in action_items if item.get('risk_level', '').upper() == 'CRITICAL']
-    high_items = [item for item in action_items if item.get('risk_level', '').upper() == 'HIGH']
-    medium_items = [item for item in action_items if item.get('risk_level', '').upper() == 'MEDIUM']
+    counts, rows = _action_items_view(assessment, action_items)
     
     # Summary
     st.info(f"📋 **{len(action_items)} action items identified** | "
-            f"🔴 {len(critical_items)} Critical | "
-            f"🟠 {len(high_items)} High | "
-            f"🟡 {len(medium_items)} Medium")
-    
-    # Critical Priority
-    if critical_items:
-        st.markdown("### 🔴 Critical Priority")
-        for idx, item in enumerate(critical_items, 1):
-            with st.expander(f"{idx}. [{item.get('pillar', 'Unknown')}] {item.get('title', 'Action Item')}", expanded=True):
-                st.markdown(item.get('description', 'No description available'))
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.caption(f"**Priority:** {item.get('priority', 'Unknown')}")
-                with col2:
-                    st.caption(f"**Effort:** {item.get('effort', 'Unknown')}")
-                with col3:
-                    st.caption(f"**Cost:** {item.get('cost', 'Unknown')}")
-    
-    # High Priority
-    if high_items:
-        st.markdown("### 🟠 High Priority")
-        for idx, item in enumerate(high_items, 1):
-            with st.expander(f"{idx}. [{item.get('pillar', 'Unknown')}] {item.get('title', 'Action Item')}"):
-                st.markdown(item.get('description', 'No description available'))
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.caption(f"**Priority:** {item.get('priority', 'Unknown')}")
-                with col2:
-                    st.caption(f"**Effort:** {item.get('effort', 'Unknown')}")
-                with col3:
-                    st.caption(f"**Cost:** {item.get('cost', 'Unknown')}")
-    
-    # Medium Priority
-    if medium_items:
-        st.markdown("### 🟡 Medium Priority")
-        for idx, item in enumerate(medium_items, 1):
-            with st.expander(f"{idx}. [{item.get('pillar', 'Unknown')}] {item.get('title', 'Action Item')}"):
-                st.markdown(item.get('description', 'No description available'))
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.caption(f"**Priority:** {item.get('priority', 'Unknown')}")
-                with col2:
-                    st.caption(f"**Effort:** {item.get('effort', 'Unknown')}")
-                with col3:
-                    st.caption(f"**Cost:** {item.get('cost', 'Unknown')}")
+            f"🔴 {counts['CRITICAL']} Critical | "
+            f"🟠 {counts['HIGH']} High | "
+            f"🟡 {counts['MEDIUM']} Medium")
+    
+    # One virtualized table instead of an expander per item
+    import pandas as pd
+    
+    st.dataframe(
+        pd.DataFrame(rows),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'Risk': st.column_config.TextColumn(width="small"),
+            'Action Item': st.column_config.TextColumn(width="medium"),
+            'Description': st.column_config.TextColumn(width="large"),
+            'Priority': st.column_config.TextColumn(width="small"),
+            'Effort': st.column_config.TextColumn(width="small"),
+            'Cost': st.column_config.TextColumn(width="small")
+        }
+    )
+
+def _export_json_bytes(assessment: Dict, pretty: bool = False) -> bytes:
+    """Serialize an assessment for download: orjson when installed, compact stdlib JSON otherwise"""
+    orjson = _optional_module("orjson")
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_DATACLASS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(assessment, default=str, option=option)
+    if pretty:
+        return json.dumps(assessment, indent=2, default=str).encode()
+    return json.dumps(assessment, separators=(',', ':'), default=str).encode()
 
+@st.cache_data(max_entries=32, show_spinner=False)
+def _export_json_cached(assessment_id: str, updated_at: str, pretty: bool, compress: bool,
+                        _assessment: Dict) -> bytes:
+    """
+    _export_json_bytes cached per saved revision: every save bumps updated_at,
+    so (id, updated_at) identifies the content and _assessment is not hashed.
+    With compress, the JSON is gzipped for large assessments.
+    """
+    data = _export_json_bytes(_assessment, pretty=pretty)
+    if compress:
+        import gzip
+        data = gzip.compress(data, compresslevel=6)
+    return data
+
+@st.fragment
 def render_reports_tab(assessment: Dict):
     """Render reports"""
     st.markdown("### 📄 Reports & Export")
@@ -2768,24 +3413,32 @@ def render_reports_tab(assessment: Dict):
     col1, col2 = st.columns(2)
     
     with col1:
-        if st.button("📊 Executive Summary (PDF)", use_container_width=True):
-            st.info("📄 PDF generation coming soon...")
+        # PDF export lives on the full report page
+        if st.button("📊 Full Report & PDF Export", use_container_width=True):
+            st.session_state.show_report = True
+            st.rerun()
     
     with col2:
-        if st.button("📥 Export Data (JSON)", use_container_width=True):
-            export_data = json.dumps(assessment, indent=2, default=str)
-            assessment_id = assessment.get('assessment_id') or assessment.get('id', 'unknown')
-            st.download_button(
-                "⬇️ Download JSON",
-                export_data,
-                file_name=f"waf_assessment_{assessment_id[:8]}.json",
-                mime="application/json"
-            )
+        pretty = st.checkbox("Pretty-print JSON", value=False, help="Indented output, for debugging")
+        compress = st.checkbox("Compress (gzip)", value=False, help="Much smaller download for large assessments")
+        # Built on every rerun so the download button stays clickable; the
+        # cache means that is one serialization per save, not per rerun
+        assessment_id = assessment.get('assessment_id') or assessment.get('id', 'unknown')
+        export_data = _export_json_cached(assessment_id, str(assessment.get('updated_at', '')),
+                                          pretty, compress, assessment)
+        st.download_button(
+            "📥 Export Data (JSON)",
+            export_data,
+            file_name=f"waf_assessment_{assessment_id[:8]}.json" + (".gz" if compress else ""),
+            mime="application/gzip" if compress else "application/json",
+            use_container_width=True
+        )
 
 # Export main function
 __all__ = [
     'Pillar', 'RiskLevel', 'AssessmentType',
     'Question', 'Choice', 'Response', 'ActionItem', 'WAFAssessment',
-    'get_complete_waf_questions',
+    'get_complete_waf_questions', 'get_questions_by_id', 'get_questions_by_pillar',
+    'get_questions_for_control', 'TOTAL_WAF_QUESTIONS',
     'render_waf_review_tab'  # Main function for streamlit_app.py
 ]
\ No newline at end of file